@@ -1,3 +1,235 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.exceptions import ImproperlyConfigured
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils.functional import cached_property
 
-# Register your models here.
+from .autocomplete import approvals_changing, indexed_values, job_changed
+from .dedupe import index_job
+from .models import Application, Job, Resume, User
+from .scoring import enqueue, enqueue_job
+from .stats import (
+    record_application,
+    record_applications_deleted,
+    record_approval_changes,
+    record_job_changed,
+    record_jobs_deleted,
+    record_jobs_posted,
+)
+
+# ============================================================
+# CHANGELIST COUNTS
+# ============================================================
+# COUNT(*) over millions of rows is the slowest part of a changelist. Counts
+# are exact up to EXACT_COUNT_LIMIT rows (a COUNT over a LIMITed subquery);
+# above that an unfiltered changelist uses the database's own row estimate
+# and a filtered one stops counting at the limit.
+
+EXACT_COUNT_LIMIT = 10_000
+
+
+def estimated_count(model, using='default'):
+    """Cheap row count estimate for a whole table, or None when unavailable."""
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table])
+        elif connection.vendor == 'mysql':
+            cursor.execute(
+                'SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s',
+                [table],
+            )
+        elif connection.vendor == 'sqlite':
+            # Rowids are handed out in increasing order, so MAX(rowid) is one
+            # B-tree descent and only overestimates by the rows deleted.
+            cursor.execute(f'SELECT MAX(rowid) FROM {connection.ops.quote_name(table)}')
+        else:
+            return None
+        row = cursor.fetchone()
+    # Postgres reports -1 for a table that was never analysed.
+    return row[0] if row and row[0] is not None and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator whose count never scans more than EXACT_COUNT_LIMIT rows."""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        capped = queryset[:EXACT_COUNT_LIMIT + 1].count()
+        if capped <= EXACT_COUNT_LIMIT or queryset.query.where:
+            return capped
+        estimate = estimated_count(queryset.model, queryset.db)
+        return max(estimate or 0, capped)
+
+
+# ============================================================
+# CHANGELIST SEARCH
+# ============================================================
+# Django compiles '^field' and '=field' to istartswith / iexact, which wrap
+# the column in UPPER() or a case-insensitive LIKE that no plain index can
+# serve. IndexedSearchMixin keeps the same search_fields syntax but matches
+# case-sensitively: a prefix becomes a range on the column and an exact
+# match an equality, and lookups across a relation become `fk IN (subquery)`
+# so every term is an index search. The whole search box is one term.
+
+PREFIX_END = '\U0010ffff'
+
+
+def indexed_lookup(model, path, operator, term):
+    """Q matching `path` on `model` with an index-friendly prefix ('^') or exact ('=') lookup."""
+    relation, _, rest = path.partition('__')
+    if rest:
+        related = model._meta.get_field(relation).related_model
+        matches = related._default_manager.filter(indexed_lookup(related, rest, operator, term))
+        return Q(**{f'{relation}__in': matches.values('pk')})
+    if operator == '^':
+        # Every string starting with `term` sorts between term and term + U+10FFFF.
+        return Q(**{f'{path}__gte': term, f'{path}__lt': term + PREFIX_END})
+    if operator == '=':
+        return Q(**{path: term})
+    raise ImproperlyConfigured(f'{model.__name__} search field {operator}{path} must start with ^ or =')
+
+
+class IndexedSearchMixin:
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        fields = self.get_search_fields(request)
+        if not term or not fields:
+            return queryset, False
+        condition = Q()
+        for field in fields:
+            condition |= indexed_lookup(queryset.model, field[1:], field[0], term)
+        return queryset.filter(condition), False
+
+
+class ScalableAdmin(IndexedSearchMixin, admin.ModelAdmin):
+    """Changelist defaults for large tables."""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+
+# ============================================================
+# MODEL ADMINS
+# ============================================================
+# Saves and deletes from the admin go through the same bookkeeping as the
+# API views: stats rollups, the autocomplete index, duplicate signatures
+# and the rescore queue.
+
+@admin.register(User)
+class UserAdmin(IndexedSearchMixin, BaseUserAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_display = ('username', 'email', 'role', 'is_staff', 'is_active')
+    list_filter = ('role', 'is_staff', 'is_active')
+    search_fields = ('^username', '=email')
+    fieldsets = BaseUserAdmin.fieldsets + (('Role', {'fields': ('role',)}),)
+    add_fieldsets = BaseUserAdmin.add_fieldsets + (('Role', {'fields': ('role',)}),)
+
+
+@admin.register(Job)
+class JobAdmin(ScalableAdmin):
+    list_display = ('title', 'employer', 'location', 'approved', 'created_at')
+    list_filter = ('approved', 'created_at')
+    list_select_related = ('employer',)
+    search_fields = ('^title', '=employer__email')
+    raw_id_fields = ('employer',)
+    ordering = ('-created_at',)
+    actions = ('approve_jobs', 'reject_jobs')
+
+    def set_approved(self, queryset, approved):
+        """Flip approval with one UPDATE and reflect it in the stats rollups and autocomplete."""
+        changing = queryset.filter(approved=not approved)
+        with transaction.atomic():
+            record_approval_changes(changing, 1 if approved else -1)
+            approvals_changing(changing, approved)
+            return changing.update(approved=approved)
+
+    def save_model(self, request, obj, form, change):
+        old = Job.objects.get(pk=obj.pk) if change else None
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            if old is None:
+                record_jobs_posted([obj])
+            else:
+                record_job_changed(old, obj)
+            job_changed(old and indexed_values(old), indexed_values(obj))
+        index_job(obj)
+        if old is not None and old.skills != obj.skills:
+            enqueue_job(obj)
+
+    def delete_model(self, request, obj):
+        self.delete_queryset(request, Job.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            record_jobs_deleted(queryset)
+            approvals_changing(queryset.filter(approved=True), False)
+            super().delete_queryset(request, queryset)
+
+    @admin.action(description='Approve selected jobs')
+    def approve_jobs(self, request, queryset):
+        updated = self.set_approved(queryset, True)
+        self.message_user(request, f'{updated} jobs approved.', messages.SUCCESS)
+
+    @admin.action(description='Reject (unapprove) selected jobs')
+    def reject_jobs(self, request, queryset):
+        updated = self.set_approved(queryset, False)
+        self.message_user(request, f'{updated} jobs rejected.', messages.SUCCESS)
+
+
+@admin.register(Application)
+class ApplicationAdmin(ScalableAdmin):
+    list_display = ('job', 'student', 'status', 'match_score', 'created_at')
+    list_filter = ('status', 'created_at')
+    list_select_related = ('job', 'student')
+    search_fields = ('=student__email', '^job__title')
+    raw_id_fields = ('job', 'student')
+    ordering = ('-created_at',)
+    actions = ('accept_applications', 'reject_applications')
+
+    def save_model(self, request, obj, form, change):
+        old = Application.objects.select_related('job').get(pk=obj.pk) if change else None
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            if old is None or old.job_id != obj.job_id:
+                if old is not None:
+                    record_application(old, -1)
+                record_application(obj)
+            if old is None or (old.job_id, old.student_id) != (obj.job_id, obj.student_id):
+                enqueue([(obj.job_id, obj.student_id)])
+
+    def delete_model(self, request, obj):
+        self.delete_queryset(request, Application.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            record_applications_deleted(queryset)
+            super().delete_queryset(request, queryset)
+
+    @admin.action(description='Accept selected applications')
+    def accept_applications(self, request, queryset):
+        updated = queryset.exclude(status='accepted').update(status='accepted')
+        self.message_user(request, f'{updated} applications accepted.', messages.SUCCESS)
+
+    @admin.action(description='Reject selected applications')
+    def reject_applications(self, request, queryset):
+        updated = queryset.exclude(status='rejected').update(status='rejected')
+        self.message_user(request, f'{updated} applications rejected.', messages.SUCCESS)
+
+
+@admin.register(Resume)
+class ResumeAdmin(ScalableAdmin):
+    list_display = ('student', 'file', 'resume_score', 'skills', 'uploaded_at')
+    list_filter = ('uploaded_at',)
+    list_select_related = ('student',)
+    search_fields = ('=student__email',)
+    raw_id_fields = ('student',)
+    ordering = ('-uploaded_at',)
+    # The extracted text can be megabytes; keep it off the change form.
+    exclude = ('text',)
@@ -2,16 +2,43 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.exceptions import PermissionDenied
+from django.http import StreamingHttpResponse
+from django.db import transaction
 from django.shortcuts import get_object_or_404
-from .models import User, Job, Application, Resume
+from django.utils import timezone
+from .models import User, Job, Application, Resume, ArchivedJob, ArchivedApplication
 from .serializers import (
     UserSerializer,
     JobSerializer,
     JobCreateSerializer,
     ApplicationSerializer,
-    ResumeSerializer
+    ResumeSerializer,
+    ArchivedJobSerializer,
+    ArchivedApplicationSerializer,
+    TalentSearchResultSerializer,
+    DuplicateJobSerializer,
+    StatsSerializer,
+    AutocompleteSerializer,
 )
+from .autocomplete import (
+    FIELDS as AUTOCOMPLETE_FIELDS,
+    MAX_LIMIT as AUTOCOMPLETE_MAX_LIMIT,
+    autocomplete_index,
+    indexed_values,
+    job_changed,
+)
+from .dedupe import find_duplicates, find_duplicates_for, index_job
+from .exports import EXPORT_FORMATS, applicant_queryset
+from .idempotency import idempotent
+from .imports import detect_format, import_jobs
+from .openapi import document, param
+from .replicas import ReplicaReadMixin
+from .scoring import enqueue_job, enqueue_student, latest_resume_skills, match_score
+from .search import SearchUnavailable, process_resume, search_talent
+from .stats import DIMENSIONS, INTERVALS, record_application, record_approvals, record_job_deleted, record_job_moved, record_jobs_posted, series
+from .throttling import IPBucketThrottle, UserBucketThrottle
 import random
+from datetime import date, timedelta
 
 # ============================================================
 # CUSTOM PERMISSIONS
@@ -25,17 +52,64 @@ class IsEmployer(permissions.BasePermission):
     def has_permission(self, request, view):
         return request.user.is_authenticated and request.user.role == 'employer'
 
+# ============================================================
+# SPARSE FIELDSETS
+# ============================================================
+
+def parse_csv_param(query_params, name):
+    """Split a comma separated query parameter into a set; None when absent."""
+    if name not in query_params:
+        return None
+    return {part.strip() for part in query_params[name].split(',') if part.strip()}
+
+def sparse_fieldset_parameters(serializer_class):
+    """Document ?fields= and ?expand= for one serializer in the OpenAPI schema."""
+    expandable = sorted(serializer_class.expandable_fields())
+    return [
+        param(
+            'fields', str,
+            description='Comma separated subset of fields to return: ' + ', '.join(serializer_class.Meta.fields),
+        ),
+        param(
+            'expand', str,
+            description=(
+                'Comma separated nested objects to embed (' + ', '.join(expandable) + ', dotted paths for '
+                'deeper levels). When given, unlisted relations are returned as their id. Defaults to all.'
+            ),
+        ),
+    ]
+
+class SparseFieldsetMixin:
+    """Apply ?fields= and ?expand= to both the SQL and the serialized output"""
+
+    def get_sparse_options(self):
+        params = self.request.query_params
+        return parse_csv_param(params, 'fields'), parse_csv_param(params, 'expand')
+
+    def get_serializer(self, *args, **kwargs):
+        fields, expand = self.get_sparse_options()
+        kwargs.setdefault('fields', fields)
+        kwargs.setdefault('expand', expand)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        fields, expand = self.get_sparse_options()
+        queryset = super().filter_queryset(queryset)
+        return self.get_serializer_class().sparse_queryset(queryset, fields, expand)
+
 # ============================================================
 # STUDENT ENDPOINTS
 # ============================================================
 
-class JobListAPIView(generics.ListAPIView):
+@document(parameters=sparse_fieldset_parameters(JobSerializer))
+class JobListAPIView(ReplicaReadMixin, SparseFieldsetMixin, generics.ListAPIView):
     """List all approved jobs for students"""
     queryset = Job.objects.filter(approved=True)
     serializer_class = JobSerializer
     permission_classes = [permissions.AllowAny]
 
-class JobDetailAPIView(generics.RetrieveAPIView):
+@document(parameters=sparse_fieldset_parameters(JobSerializer))
+class JobDetailAPIView(ReplicaReadMixin, SparseFieldsetMixin, generics.RetrieveAPIView):
     """View one job details"""
     queryset = Job.objects.filter(approved=True)
     serializer_class = JobSerializer
@@ -43,23 +117,62 @@ class JobDetailAPIView(generics.RetrieveAPIView):
     lookup_url_kwarg = 'job_id'
     permission_classes = [permissions.AllowAny]
 
+@document(
+    parameters=[
+        param('q', str, required=True, description='Prefix typed so far (case-insensitive)'),
+        param('field', str, enum=AUTOCOMPLETE_FIELDS, description='Only suggest this field (default: all)'),
+        param('limit', int, description=f'Suggestions per field (default 10, max {AUTOCOMPLETE_MAX_LIMIT})'),
+    ],
+    responses=AutocompleteSerializer,
+)
+class JobAutocompleteAPIView(APIView):
+    """Most used job titles, skills and locations starting with a prefix"""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        prefix = request.query_params.get('q', '')
+        if not prefix.strip():
+            return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+        field = request.query_params.get('field')
+        if field is not None and field not in AUTOCOMPLETE_FIELDS:
+            return Response({'error': 'Invalid field'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), AUTOCOMPLETE_MAX_LIMIT)
+        except ValueError:
+            return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+
+        fields = (field,) if field else AUTOCOMPLETE_FIELDS
+        suggestions = autocomplete_index().suggest(prefix, fields, limit)
+        data = {
+            name: [{'value': value, 'count': count} for value, count in matches]
+            for name, matches in suggestions.items()
+        }
+        return Response(AutocompleteSerializer(data).data, status=status.HTTP_200_OK)
+
 class ApplyJobAPIView(APIView):
     """Student applies for a job"""
     permission_classes = [IsStudent]
+    throttle_classes = [IPBucketThrottle, UserBucketThrottle]
+    throttle_scope = 'apply'
 
+    @idempotent
     def post(self, request, job_id):
         job = get_object_or_404(Job, id=job_id, approved=True)
         if Application.objects.filter(job=job, student=request.user).exists():
             return Response({'message': 'Already applied!'}, status=status.HTTP_400_BAD_REQUEST)
 
-        app = Application.objects.create(
-            job=job,
-            student=request.user,
-            match_score=random.randint(50, 100)
-        )
+        resume_skills = latest_resume_skills([request.user.pk]).get(request.user.pk, '')
+        with transaction.atomic():
+            app = Application.objects.create(
+                job=job,
+                student=request.user,
+                match_score=match_score(job.skills, resume_skills)
+            )
+            record_application(app)
         return Response(ApplicationSerializer(app).data, status=status.HTTP_201_CREATED)
 
-class StudentApplicationsAPIView(generics.ListAPIView):
+@document(parameters=sparse_fieldset_parameters(ApplicationSerializer))
+class StudentApplicationsAPIView(ReplicaReadMixin, SparseFieldsetMixin, generics.ListAPIView):
     """Student views their applications"""
     serializer_class = ApplicationSerializer
     permission_classes = [IsStudent]
@@ -67,10 +180,23 @@ class StudentApplicationsAPIView(generics.ListAPIView):
     def get_queryset(self):
         return Application.objects.filter(student=self.request.user)
 
+class StudentApplicationHistoryAPIView(ReplicaReadMixin, generics.ListAPIView):
+    """Student views their archived applications (read-only)"""
+    serializer_class = ArchivedApplicationSerializer
+    permission_classes = [IsStudent]
+
+    def get_queryset(self):
+        return (
+            ArchivedApplication.objects.filter(student=self.request.user)
+            .select_related('job', 'student')
+            .order_by('-created_at')
+        )
+
 class UploadResumeAPIView(APIView):
     """Student uploads a resume"""
     permission_classes = [IsStudent]
 
+    @idempotent
     def post(self, request):
         file = request.FILES.get('file')
         if not file:
@@ -82,13 +208,16 @@ class UploadResumeAPIView(APIView):
             resume_score=random.randint(60, 95),
             feedback='Add more technical details and expand soft skills.'
         )
+        process_resume(resume)
+        enqueue_student(request.user)
         return Response(ResumeSerializer(resume).data, status=status.HTTP_201_CREATED)
 
 # ============================================================
 # EMPLOYER ENDPOINTS
 # ============================================================
 
-class EmployerJobListAPIView(generics.ListAPIView):
+@document(parameters=sparse_fieldset_parameters(JobSerializer))
+class EmployerJobListAPIView(ReplicaReadMixin, SparseFieldsetMixin, generics.ListAPIView):
     """List all jobs posted by this employer"""
     serializer_class = JobSerializer
     permission_classes = [IsEmployer]
@@ -96,12 +225,39 @@ class EmployerJobListAPIView(generics.ListAPIView):
     def get_queryset(self):
         return Job.objects.filter(employer=self.request.user)
 
+class EmployerJobHistoryAPIView(ReplicaReadMixin, generics.ListAPIView):
+    """Employer views their archived jobs (read-only)"""
+    serializer_class = ArchivedJobSerializer
+    permission_classes = [IsEmployer]
+
+    def get_queryset(self):
+        return ArchivedJob.objects.filter(employer=self.request.user).order_by('-created_at')
+
+class EmployerJobArchivedApplicationsAPIView(ReplicaReadMixin, generics.ListAPIView):
+    """Employer views the archived applications of one archived job (read-only)"""
+    serializer_class = ArchivedApplicationSerializer
+    permission_classes = [IsEmployer]
+
+    def get_queryset(self):
+        return (
+            ArchivedApplication.objects.filter(job__id=self.kwargs['job_id'], job__employer=self.request.user)
+            .select_related('job', 'student')
+            .order_by('created_at')
+        )
+
 class EmployerJobCreateAPIView(generics.CreateAPIView):
     serializer_class = JobCreateSerializer
     permission_classes = [IsEmployer]
 
+    @idempotent
+    def post(self, request, *args, **kwargs):
+        return self.create(request, *args, **kwargs)
+
     def perform_create(self, serializer):
-        serializer.save(employer=self.request.user, approved=False)
+        with transaction.atomic():
+            job = serializer.save(employer=self.request.user, approved=False)
+            record_jobs_posted([job])
+        index_job(job)
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -110,7 +266,32 @@ class EmployerJobCreateAPIView(generics.CreateAPIView):
 
         
         job = serializer.instance
-        return Response(JobSerializer(job).data, status=status.HTTP_201_CREATED)
+        data = JobSerializer(job).data
+        # Only the employer's own postings are shown back to them.
+        duplicates = find_duplicates(job, employer=request.user)
+        data['possible_duplicates'] = DuplicateJobSerializer(duplicates, many=True).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
+class EmployerJobImportAPIView(APIView):
+    """Bulk create jobs from an uploaded JSON array, CSV or NDJSON file"""
+    permission_classes = [IsEmployer]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response({'error': 'No file uploaded'}, status=status.HTTP_400_BAD_REQUEST)
+
+        fmt = detect_format(upload, request.query_params.get('type'))
+        if fmt is None:
+            return Response({'error': 'Unsupported import type'}, status=status.HTTP_400_BAD_REQUEST)
+
+        job_import, error = import_jobs(request.user, upload, fmt)
+        summary = job_import.summary()
+        if error:
+            summary['error'] = error
+            return Response(summary, status=status.HTTP_400_BAD_REQUEST)
+        created = status.HTTP_201_CREATED if job_import.created else status.HTTP_400_BAD_REQUEST
+        return Response(summary, status=created)
 
 class EmployerJobUpdateAPIView(generics.RetrieveUpdateAPIView):
     serializer_class = JobCreateSerializer
@@ -121,15 +302,31 @@ class EmployerJobUpdateAPIView(generics.RetrieveUpdateAPIView):
     def get_queryset(self):
         return Job.objects.filter(employer=self.request.user)
 
+    def perform_update(self, serializer):
+        old_skills = serializer.instance.skills
+        old_location = serializer.instance.location
+        before = indexed_values(serializer.instance)
+        with transaction.atomic():
+            job = serializer.save()
+            record_job_moved(job, old_location)
+            job_changed(before, indexed_values(job))
+        index_job(job)
+        if job.skills != old_skills:
+            enqueue_job(job)
+
 class EmployerJobDeleteAPIView(APIView):
     permission_classes = [IsEmployer]
 
     def delete(self, request, job_id):
         job = get_object_or_404(Job, id=job_id, employer=request.user)
-        job.delete()
+        with transaction.atomic():
+            record_job_deleted(job)
+            job.delete()
+            job_changed(indexed_values(job), None)
         return Response({'message': 'Job deleted successfully.'}, status=status.HTTP_200_OK)
 
-class EmployerJobApplicationsAPIView(generics.ListAPIView):
+@document(parameters=sparse_fieldset_parameters(ApplicationSerializer))
+class EmployerJobApplicationsAPIView(ReplicaReadMixin, SparseFieldsetMixin, generics.ListAPIView):
     serializer_class = ApplicationSerializer
     permission_classes = [IsEmployer]
 
@@ -137,6 +334,47 @@ class EmployerJobApplicationsAPIView(generics.ListAPIView):
         job_id = self.kwargs['job_id']
         return Application.objects.filter(job__id=job_id, job__employer=self.request.user)
 
+class EmployerJobApplicationsExportAPIView(APIView):
+    """Stream every applicant of one job as CSV (default) or NDJSON (?type=ndjson)"""
+    permission_classes = [IsEmployer]
+
+    def get(self, request, job_id):
+        job = get_object_or_404(Job, id=job_id, employer=request.user)
+        export_type = request.query_params.get('type', 'csv')
+        if export_type not in EXPORT_FORMATS:
+            return Response({'error': 'Invalid export type'}, status=status.HTTP_400_BAD_REQUEST)
+
+        content_type, extension, stream = EXPORT_FORMATS[export_type]
+        response = StreamingHttpResponse(stream(applicant_queryset(job)), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="applicants-{job.id}.{extension}"'
+        return response
+
+@document(
+    parameters=[
+        param('q', str, required=True, description='Keywords to find in resume text and skills'),
+        param('limit', int, description='Maximum results (default 20, max 100)'),
+    ],
+    responses=TalentSearchResultSerializer(many=True),
+)
+class EmployerTalentSearchAPIView(APIView):
+    """Rank students who applied to this employer's jobs by resume relevance"""
+    permission_classes = [IsEmployer]
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            results = search_talent(request.user, query, limit)
+        except SearchUnavailable as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        return Response(TalentSearchResultSerializer(results, many=True).data, status=status.HTTP_200_OK)
+
 class UpdateApplicationStatusAPIView(APIView):
     permission_classes = [IsEmployer]
 
@@ -154,18 +392,65 @@ class UpdateApplicationStatusAPIView(APIView):
 # ADMIN ENDPOINTS
 # ============================================================
 
-class PendingJobsAPIView(generics.ListAPIView):
+@document(parameters=sparse_fieldset_parameters(JobSerializer))
+class PendingJobsAPIView(SparseFieldsetMixin, generics.ListAPIView):
     serializer_class = JobSerializer
     permission_classes = [permissions.IsAdminUser]
 
     def get_queryset(self):
         return Job.objects.filter(approved=False)
 
+    def list(self, request, *args, **kwargs):
+        jobs = list(self.filter_queryset(self.get_queryset()))
+        duplicates = find_duplicates_for(jobs)
+        data = self.get_serializer(jobs, many=True).data
+        for job, row in zip(jobs, data):
+            row['possible_duplicates'] = DuplicateJobSerializer(duplicates[job.pk], many=True).data
+        return Response(data)
+
 class ApproveJobAPIView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
     def post(self, request, job_id):
         job = get_object_or_404(Job, id=job_id)
-        job.approved = True
-        job.save()
+        with transaction.atomic():
+            # Only an unapproved job changes the rollups; re-approving is a no-op.
+            if Job.objects.filter(id=job.id, approved=False).update(approved=True):
+                record_approvals([job])
+                job_changed(None, (job.title, job.skills, job.location))
         return Response({'message': 'Job approved successfully.'}, status=status.HTTP_200_OK)
+
+@document(
+    parameters=[
+        param('start', 'DATE', description='First day (default: 29 days before end)'),
+        param('end', 'DATE', description='Last day, inclusive (default: today)'),
+        param('interval', str, enum=INTERVALS, description='Bucket size (default day)'),
+        param('group_by', str, enum=DIMENSIONS, description='Split every bucket by location or employer'),
+        param('value', str, description='With group_by, only this location or employer id'),
+    ],
+    responses=StatsSerializer,
+)
+class PlatformStatsAPIView(APIView):
+    """Jobs posted, approved and applied to over a date range, from the daily rollups"""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            end = date.fromisoformat(params['end']) if 'end' in params else timezone.localdate()
+            start = date.fromisoformat(params['start']) if 'start' in params else end - timedelta(days=29)
+        except ValueError:
+            return Response({'error': 'start and end must be YYYY-MM-DD dates'}, status=status.HTTP_400_BAD_REQUEST)
+        if start > end:
+            return Response({'error': 'start must not be after end'}, status=status.HTTP_400_BAD_REQUEST)
+        interval = params.get('interval', 'day')
+        if interval not in INTERVALS:
+            return Response({'error': 'Invalid interval'}, status=status.HTTP_400_BAD_REQUEST)
+        group_by = params.get('group_by')
+        if group_by is not None and group_by not in DIMENSIONS:
+            return Response({'error': 'Invalid group_by'}, status=status.HTTP_400_BAD_REQUEST)
+
+        value = params.get('value') if group_by else None
+        buckets = series(start, end, interval, group_by, value)
+        data = {'start': start, 'end': end, 'interval': interval, 'group_by': group_by, 'buckets': buckets}
+        return Response(StatsSerializer(data).data, status=status.HTTP_200_OK)
@@ -4,6 +4,7 @@ from django.contrib.auth import get_user_model, authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.views import APIView
 from .serializers import UserSerializer, JobSerializer, JobCreateSerializer, ApplicationSerializer, ResumeSerializer
+from .throttling import AccountBucketThrottle, IPBucketThrottle
 
 User = get_user_model()
 
@@ -13,6 +14,8 @@ User = get_user_model()
 # ---------------------------------------------------------
 class RegisterAPIView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [IPBucketThrottle]
+    throttle_scope = "register"
 
     def post(self, request):
         username = request.data.get("username")
@@ -53,6 +56,8 @@ class RegisterAPIView(APIView):
 # ---------------------------------------------------------
 class LoginAPIView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [IPBucketThrottle, AccountBucketThrottle]
+    throttle_scope = "login"
 
     def post(self, request):
         email = request.data.get("email")
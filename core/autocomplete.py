@@ -0,0 +1,228 @@
+import heapq
+import itertools
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from .models import Job
+
+# ============================================================
+# AUTOCOMPLETE
+# ============================================================
+# Type-ahead for job titles, skills and locations from an in-memory index of
+# approved jobs, one per worker process. Each field keeps its distinct terms
+# (case-folded) in a sorted list, so a prefix is a bisect away, plus how
+# many approved jobs use each term. Approving, rejecting, editing and
+# deleting a job adjust the counts once the change commits; the whole index
+# is rebuilt in the background when older than settings.AUTOCOMPLETE_MAX_AGE
+# so the other workers, and jobs changed outside these paths, catch up.
+# Memory is bounded by AUTOCOMPLETE_MAX_TERMS distinct terms per field (the
+# least used are dropped) and MAX_CACHED_PREFIXES memoised answers.
+
+FIELDS = ('title', 'skills', 'location')
+MAX_LIMIT = 20
+MAX_CACHED_PREFIXES = 2000
+# Bulk changes touching more jobs than this rebuild the index instead.
+MAX_DELTA_JOBS = 1000
+
+
+def normalise(term):
+    return ' '.join(term.split())
+
+
+def job_terms(title, skills, location):
+    """The terms one job contributes to each field."""
+    return {
+        'title': {normalise(title)} - {''},
+        'skills': {normalise(skill) for skill in skills.split(',')} - {''},
+        'location': {normalise(location)} - {''},
+    }
+
+
+class PrefixIndex:
+    """Distinct terms of one field in sorted order, with their job counts."""
+
+    def __init__(self, counts=(), max_terms=None):
+        self.max_terms = max_terms
+        # Case-folded key -> [count, display form]
+        self.terms = {}
+        for term, count in counts:
+            key = term.casefold()
+            entry = self.terms.get(key)
+            if entry is None:
+                self.terms[key] = [count, term]
+            else:
+                entry[0] += count
+        if max_terms is not None and len(self.terms) > max_terms:
+            kept = heapq.nlargest(max_terms, self.terms.items(), key=lambda item: item[1][0])
+            self.terms = dict(kept)
+        self.keys = sorted(self.terms)
+        self.cache = {}
+
+    def add(self, term, delta):
+        key = term.casefold()
+        entry = self.terms.get(key)
+        if entry is None:
+            if delta <= 0 or (self.max_terms is not None and len(self.terms) >= self.max_terms):
+                return
+            self.terms[key] = [delta, term]
+            insort(self.keys, key)
+        else:
+            entry[0] += delta
+            if entry[0] <= 0:
+                del self.terms[key]
+                del self.keys[bisect_left(self.keys, key)]
+        self.cache.clear()
+
+    def top(self, prefix, limit):
+        """Most used terms starting with `prefix` as (term, count), most used first."""
+        prefix = prefix.casefold()
+        cached = self.cache.get(prefix)
+        if cached is None:
+            start = bisect_left(self.keys, prefix)
+            # Every key sharing the prefix sorts before prefix + U+10FFFF.
+            end = bisect_left(self.keys, prefix + '\U0010ffff', start)
+            matches = heapq.nsmallest(
+                MAX_LIMIT,
+                ((-self.terms[key][0], key) for key in self.keys[start:end]),
+            )
+            cached = [(self.terms[key][1], -negative) for negative, key in matches]
+            if len(self.cache) >= MAX_CACHED_PREFIXES:
+                self.cache.clear()
+            self.cache[prefix] = cached
+        return cached[:limit]
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class AutocompleteIndex:
+    def __init__(self, fields, built_at, generation):
+        self.fields = fields
+        self.built_at = built_at
+        self.generation = generation
+        self.lock = threading.Lock()
+
+    @classmethod
+    def build(cls, max_terms=None):
+        generation = next(_generations)
+        counts = {field: Counter() for field in FIELDS}
+        rows = Job.objects.filter(approved=True).values_list('title', 'skills', 'location')
+        for row in rows.iterator(chunk_size=2000):
+            for field, terms in job_terms(*row).items():
+                counts[field].update(terms)
+        fields = {field: PrefixIndex(counts[field].items(), max_terms) for field in FIELDS}
+        return cls(fields, time.monotonic(), generation)
+
+    def apply(self, terms, delta):
+        with self.lock:
+            for field, values in terms.items():
+                for term in values:
+                    self.fields[field].add(term, delta)
+
+    def suggest(self, prefix, fields=FIELDS, limit=10):
+        prefix = normalise(prefix)
+        with self.lock:
+            return {field: self.fields[field].top(prefix, limit) for field in fields}
+
+
+_index = None
+# Held while an index is being built, so only one build runs at a time.
+_index_lock = threading.Lock()
+_generations = itertools.count(1)
+
+
+def build_index():
+    global _index
+    _index = AutocompleteIndex.build(getattr(settings, 'AUTOCOMPLETE_MAX_TERMS', 20_000))
+    return _index
+
+
+def rebuild_in_background():
+    try:
+        build_index()
+    finally:
+        connections.close_all()
+        _index_lock.release()
+
+
+def autocomplete_index():
+    """
+    The process-wide index. The first call builds it; once it is older than
+    AUTOCOMPLETE_MAX_AGE one background thread rebuilds it while requests
+    keep using the old one.
+    """
+    index = _index
+    if index is None:
+        with _index_lock:
+            return _index or build_index()
+    max_age = getattr(settings, 'AUTOCOMPLETE_MAX_AGE', 300)
+    if time.monotonic() - index.built_at > max_age and _index_lock.acquire(blocking=False):
+        threading.Thread(target=rebuild_in_background, name='autocomplete-rebuild', daemon=True).start()
+    return index
+
+
+def reset_autocomplete_index():
+    global _index
+    _index = None
+
+
+def expire_autocomplete_index():
+    """Have the next request start a background rebuild."""
+    index = _index
+    if index is not None:
+        index.built_at = float('-inf')
+
+
+def jobs_changed(removed=(), added=()):
+    """
+    Approved jobs changed: `removed` and `added` are the (title, skills,
+    location) they stopped and started contributing. Applied on commit.
+    """
+    removed, added = list(removed), list(added)
+    if removed == added:
+        return
+    generation = _index.generation if _index is not None else None
+
+    def apply():
+        index = _index
+        if index is None or index.generation != generation:
+            # Not built yet, or rebuilt since the change was made: the new
+            # build may already include it, and counting it again would
+            # double it. Anything it missed is picked up by the next rebuild.
+            return
+        for values in removed:
+            index.apply(job_terms(*values), -1)
+        for values in added:
+            index.apply(job_terms(*values), 1)
+
+    transaction.on_commit(apply)
+
+
+def indexed_values(job):
+    """What a job contributes to the index, or None when it is not approved."""
+    return (job.title, job.skills, job.location) if job.approved else None
+
+
+def job_changed(before, after):
+    """One job changed; `before` / `after` are its indexed_values() around the change."""
+    jobs_changed([before] if before else [], [after] if after else [])
+
+
+def approvals_changing(jobs, approved):
+    """
+    Every job in the `jobs` queryset is about to be approved (or have its
+    approval withdrawn). Up to MAX_DELTA_JOBS are applied as deltas on
+    commit; a larger change expires the index so it is rebuilt instead.
+    """
+    values = list(jobs.values_list('title', 'skills', 'location')[:MAX_DELTA_JOBS + 1])
+    if len(values) > MAX_DELTA_JOBS:
+        transaction.on_commit(expire_autocomplete_index)
+    elif approved:
+        jobs_changed(added=values)
+    else:
+        jobs_changed(removed=values)
@@ -0,0 +1,94 @@
+import os
+import resource
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.db import connections
+from django.test.utils import setup_databases, teardown_databases
+
+from .models import User, Job, Application
+
+# ============================================================
+# BENCHMARK HELPERS
+# ============================================================
+# Shared by the bench_* management commands. Benchmarks run against a
+# throwaway test database so the real database is never touched.
+
+BULK_BATCH_SIZE = 5000
+
+
+@contextmanager
+def bench_database(shared=False):
+    """
+    Create the test database(s) for the duration of the block.
+
+    With `shared`, an SQLite test database is a file rather than in memory,
+    so subprocesses can open it through connections['default'].settings_dict['NAME'].
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        test_settings = connections['default'].settings_dict['TEST']
+        if shared and connections['default'].vendor == 'sqlite' and not test_settings.get('NAME'):
+            test_settings['NAME'] = os.path.join(tmp, 'bench.sqlite3')
+        config = setup_databases(verbosity=0, interactive=False)
+        try:
+            yield
+        finally:
+            teardown_databases(config, verbosity=0)
+
+
+@contextmanager
+def timed(results, key):
+    """Store the wall-clock seconds spent in the block under results[key]."""
+    start = time.perf_counter()
+    yield
+    results[key] = time.perf_counter() - start
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def make_employer(prefix='bench'):
+    tag = uuid.uuid4().hex[:8]
+    return User.objects.create(
+        username=f'{prefix}_employer_{tag}', email=f'{prefix}_employer_{tag}@example.com', role='employer'
+    )
+
+
+def make_students(count, prefix='bench'):
+    tag = uuid.uuid4().hex[:8]
+    students = [
+        User(username=f'{prefix}_{tag}_{i}', email=f'{prefix}_{tag}_{i}@example.com', role='student', password='!')
+        for i in range(count)
+    ]
+    User.objects.bulk_create(students, batch_size=BULK_BATCH_SIZE)
+    return students
+
+
+def make_jobs(employer, count, approved=True, **fields):
+    jobs = [
+        Job(
+            employer=employer,
+            title=fields.get('title', f'Benchmark Job {i}'),
+            description=fields.get('description', 'Benchmark description ' * 20),
+            location=fields.get('location', 'Harare'),
+            duration=fields.get('duration', '6 months'),
+            skills=fields.get('skills', 'Python, Django, SQL'),
+            approved=approved,
+        )
+        for i in range(count)
+    ]
+    Job.objects.bulk_create(jobs, batch_size=BULK_BATCH_SIZE)
+    return jobs
+
+
+def make_applications(job, students):
+    apps = [Application(job=job, student=student, match_score=75) for student in students]
+    Application.objects.bulk_create(apps, batch_size=BULK_BATCH_SIZE)
+    return apps
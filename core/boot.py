@@ -0,0 +1,83 @@
+"""
+Cold-boot probe used by the profile_imports and bench_boot commands.
+
+Run as `python -m core.boot --entry wsgi --path /api/jobs/` in a fresh
+interpreter: it imports the WSGI/ASGI entry point, serves one GET request
+through it and prints the timings as JSON. Only stdlib is imported at the
+top so the measurement starts before Django is loaded.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+
+def serve_wsgi(path):
+    from wsgiref.util import setup_testing_defaults
+    from zou_jobfinder.wsgi import application
+
+    imported = time.perf_counter()
+    environ = {'PATH_INFO': path, 'HTTP_HOST': 'localhost'}
+    setup_testing_defaults(environ)
+    statuses = []
+    body = b''.join(application(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+    return imported, int(statuses[0].split()[0]), len(body)
+
+
+def serve_asgi(path):
+    from zou_jobfinder.asgi import application
+
+    imported = time.perf_counter()
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+        'headers': [(b'host', b'localhost')], 'server': ('localhost', 80), 'client': ('127.0.0.1', 0),
+    }
+    response = {'status': 0, 'size': 0}
+    requests = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        # Nothing more to send; Django cancels this wait once the response is done.
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+        elif message['type'] == 'http.response.body':
+            response['size'] += len(message.get('body', b''))
+
+    asyncio.run(application(scope, receive, send))
+    return imported, response['status'], response['size']
+
+
+ENTRY_POINTS = {'wsgi': serve_wsgi, 'asgi': serve_asgi}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entry', choices=ENTRY_POINTS, default='wsgi')
+    parser.add_argument('--path', default='/api/jobs/')
+    parser.add_argument('--settings', default=None)
+    args = parser.parse_args(argv)
+
+    if args.settings:
+        os.environ['DJANGO_SETTINGS_MODULE'] = args.settings
+    start = time.perf_counter()
+    imported, status_code, size = ENTRY_POINTS[args.entry](args.path)
+    served = time.perf_counter()
+    json.dump({
+        'import_ms': (imported - start) * 1000,
+        'first_request_ms': (served - imported) * 1000,
+        'boot_to_first_response_ms': (served - start) * 1000,
+        'status': status_code,
+        'bytes': size,
+        'modules': len(sys.modules),
+    }, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
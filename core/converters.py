@@ -0,0 +1,26 @@
+import uuid
+
+from .models import LegacyId
+
+# ============================================================
+# URL CONVERTERS
+# ============================================================
+
+
+class RecordIdConverter:
+    """
+    A UUID path segment that also accepts ids replaced by `rekey_uuid7`.
+
+    Only non-v7 ids can be legacy ones, so new ids never cost a query.
+    """
+
+    regex = '[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
+
+    def to_python(self, value):
+        value = uuid.UUID(value)
+        if value.version == 7:
+            return value
+        return LegacyId.objects.filter(old_id=value).values_list('new_id', flat=True).first() or value
+
+    def to_url(self, value):
+        return str(value)
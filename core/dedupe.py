@@ -0,0 +1,216 @@
+import hashlib
+import random
+import re
+import zlib
+from array import array
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .models import Job, JobLSHBucket, JobSignature
+
+# ============================================================
+# NEAR-DUPLICATE JOBS (MinHash + LSH)
+# ============================================================
+# A job is reduced to a set of shingles (word pairs of its title and
+# description plus its individual skills) and summarised by NUM_PERM MinHash
+# values, whose agreement estimates the Jaccard similarity of two jobs.
+# The signature is cut into BANDS bands of ROWS values; each band is hashed
+# into an indexed JobLSHBucket row. Only jobs sharing a bucket are compared,
+# so a lookup costs BANDS index probes instead of a scan of every job.
+# With 16 bands of 4 rows, pairs at 0.8 similarity collide with >99.9%
+# probability and pairs below 0.3 almost never do. A lookup reads at most
+# MAX_CANDIDATES of the most recently indexed jobs per bucket, capped in SQL,
+# so a bucket crowded by mass re-posts or boilerplate stays cheap.
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+MAX_CANDIDATES = 200
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_WORD = re.compile(r'\w+')
+
+
+def duplicate_threshold():
+    return getattr(settings, 'DUPLICATE_JOB_THRESHOLD', 0.8)
+
+
+def shingles(title, description, skills):
+    words = _WORD.findall(f'{title} {description}'.lower())
+    found = {f'{a} {b}' for a, b in zip(words, words[1:])} or set(words)
+    found.update('skill:' + skill.strip().lower() for skill in skills.split(',') if skill.strip())
+    return found
+
+
+def minhash(features):
+    """NUM_PERM minimum hash values of the feature set (all _PRIME for an empty set)."""
+    hashes = [zlib.crc32(feature.encode()) for feature in features]
+    if not hashes:
+        return array('Q', [_PRIME] * NUM_PERM)
+    return array('Q', [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS])
+
+
+def job_signature(job):
+    return minhash(shingles(job.title, job.description, job.skills))
+
+
+def band_buckets(signature):
+    """One signed 64-bit bucket key per band."""
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(band.to_bytes(2, 'little') + rows.tobytes(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def load_signature(data):
+    signature = array('Q')
+    signature.frombytes(bytes(data))
+    return signature
+
+
+def index_jobs(jobs):
+    """(Re)compute and store the signatures and buckets of these jobs."""
+    jobs = list(jobs)
+    if not jobs:
+        return {}
+    signatures = {job.pk: job_signature(job) for job in jobs}
+    with transaction.atomic():
+        JobSignature.objects.filter(job_id__in=signatures).delete()
+        JobLSHBucket.objects.filter(job_id__in=signatures).delete()
+        JobSignature.objects.bulk_create(
+            [JobSignature(job_id=job_id, minhash=signature.tobytes()) for job_id, signature in signatures.items()]
+        )
+        JobLSHBucket.objects.bulk_create([
+            JobLSHBucket(job_id=job_id, bucket=bucket)
+            for job_id, signature in signatures.items()
+            for bucket in band_buckets(signature)
+        ])
+    return signatures
+
+
+def index_job(job):
+    return index_jobs([job])[job.pk]
+
+
+def clear_index():
+    JobLSHBucket.objects.all().delete()
+    JobSignature.objects.all().delete()
+
+
+def find_duplicates_for(jobs, employer=None, threshold=None):
+    """
+    Map each job's id to its likely duplicates, most similar first.
+
+    Each duplicate is a dict with the job's id, title, employer id and
+    estimated similarity. Jobs without a signature are indexed first.
+    `employer` restricts the candidates to that employer's postings.
+    """
+    threshold = duplicate_threshold() if threshold is None else threshold
+    jobs = list(jobs)
+    if not jobs:
+        return {}
+    signatures = {
+        job_id: load_signature(data)
+        for job_id, data in JobSignature.objects.filter(job_id__in=[job.pk for job in jobs]).values_list('job_id', 'minhash')
+    }
+    missing = [job.pk for job in jobs if job.pk not in signatures]
+    if missing:
+        # Reload so callers may pass jobs fetched with only() a few columns.
+        signatures.update(index_jobs(Job.objects.filter(pk__in=missing).only('id', 'title', 'description', 'skills')))
+
+    buckets = {job.pk: band_buckets(signatures[job.pk]) for job in jobs}
+    collisions = JobLSHBucket.objects.filter(bucket__in={key for keys in buckets.values() for key in keys})
+    if employer is not None:
+        collisions = collisions.filter(job__employer=employer)
+    collisions = collisions.annotate(
+        rank=Window(RowNumber(), partition_by=F('bucket'), order_by=F('id').desc()),
+    ).filter(rank__lte=MAX_CANDIDATES)
+    members = defaultdict(list)
+    for bucket, job_id in collisions.values_list('bucket', 'job_id'):
+        members[bucket].append(job_id)
+
+    candidates = {job.pk: {c for key in buckets[job.pk] for c in members[key]} - {job.pk} for job in jobs}
+    wanted = set().union(*candidates.values()) - signatures.keys()
+    for job_id, data in JobSignature.objects.filter(job_id__in=wanted).values_list('job_id', 'minhash'):
+        signatures[job_id] = load_signature(data)
+
+    scored = {
+        job.pk: sorted(
+            ((similarity(signatures[job.pk], signatures[c]), c) for c in candidates[job.pk] if c in signatures),
+            key=lambda pair: -pair[0],
+        )
+        for job in jobs
+    }
+    matched = {c for pairs in scored.values() for score, c in pairs if score >= threshold}
+    details = Job.objects.filter(pk__in=matched).only('id', 'title', 'employer_id').in_bulk()
+    return {
+        job_id: [
+            {'id': c, 'title': details[c].title, 'employer': details[c].employer_id, 'similarity': score}
+            for score, c in pairs if score >= threshold and c in details
+        ]
+        for job_id, pairs in scored.items()
+    }
+
+
+def find_duplicates(job, employer=None, threshold=None):
+    return find_duplicates_for([job], employer, threshold)[job.pk]
+
+
+def duplicate_clusters(threshold=None):
+    """
+    Group every indexed job into clusters of near-duplicates (size >= 2).
+
+    Jobs sharing a bucket are compared with the first job seen in that
+    bucket and joined with union-find, which keeps each bucket linear.
+    """
+    threshold = duplicate_threshold() if threshold is None else threshold
+    groups = []
+    current, members = None, []
+    for bucket, job_id in JobLSHBucket.objects.order_by('bucket').values_list('bucket', 'job_id').iterator(chunk_size=5000):
+        if bucket != current:
+            if len(members) > 1:
+                groups.append(members)
+            current, members = bucket, []
+        members.append(job_id)
+    if len(members) > 1:
+        groups.append(members)
+
+    involved = {job_id for members in groups for job_id in members}
+    signatures = {}
+    ids = list(involved)
+    for start in range(0, len(ids), 5000):
+        for job_id, data in JobSignature.objects.filter(job_id__in=ids[start:start + 5000]).values_list('job_id', 'minhash'):
+            signatures[job_id] = load_signature(data)
+
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for members in groups:
+        first = members[0]
+        for other in members[1:]:
+            if similarity(signatures[first], signatures[other]) >= threshold:
+                parent[find(other)] = find(first)
+
+    clusters = defaultdict(list)
+    for job_id in parent:
+        clusters[find(job_id)].append(job_id)
+    return sorted((members for members in clusters.values() if len(members) > 1), key=len, reverse=True)
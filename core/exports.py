@@ -0,0 +1,86 @@
+import csv
+import json
+
+from .models import Application
+
+# ============================================================
+# STREAMING APPLICANT EXPORT
+# ============================================================
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_COLUMNS = [
+    'application_id',
+    'status',
+    'match_score',
+    'applied_at',
+    'student_id',
+    'student_username',
+    'student_email',
+]
+
+
+# Spreadsheets run a cell starting with one of these as a formula; such
+# text cells get a leading apostrophe so they open as plain text.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class Echo:
+    """File-like object whose write() hands the value straight back to the csv writer."""
+
+    def write(self, value):
+        return value
+
+
+def applicant_queryset(job):
+    """Applications for a job, joined to the student row and trimmed to exported columns."""
+    return (
+        Application.objects.filter(job=job)
+        .select_related('student')
+        .only(
+            'id', 'status', 'match_score', 'created_at',
+            'student__id', 'student__username', 'student__email',
+        )
+        .order_by('created_at', 'id')
+    )
+
+
+def applicant_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield one flat tuple per application without caching the queryset."""
+    for app in queryset.iterator(chunk_size=chunk_size):
+        yield (
+            str(app.id),
+            app.status,
+            app.match_score,
+            app.created_at.isoformat(),
+            str(app.student.id),
+            app.student.username,
+            app.student.email,
+        )
+
+
+def csv_safe(value):
+    """Defuse user text that a spreadsheet would evaluate as a formula."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the header line first, then one CSV line per application."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in applicant_rows(queryset, chunk_size):
+        yield writer.writerow([csv_safe(value) for value in row])
+
+
+def stream_ndjson(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield one JSON object per line, one line per application."""
+    for row in applicant_rows(queryset, chunk_size):
+        yield json.dumps(dict(zip(EXPORT_COLUMNS, row))) + '\n'
+
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv', stream_csv),
+    'ndjson': ('application/x-ndjson', 'ndjson', stream_ndjson),
+}
@@ -0,0 +1,140 @@
+import functools
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import IdempotencyRecord
+
+# ============================================================
+# IDEMPOTENCY KEYS
+# ============================================================
+# POST handlers decorated with @idempotent honour an Idempotency-Key header.
+# The first request claims (user, method + path, key) by inserting an
+# in-flight record; its response is stored on the record and replayed to
+# every retry until settings.IDEMPOTENCY_KEY_TTL runs out. A retry that
+# arrives while the first request is still running gets 409 with
+# Retry-After straight away; one left in flight for IDEMPOTENCY_LOCK_SECONDS
+# is treated as abandoned. 5xx responses and exceptions release the key so
+# the client can retry.
+# Storage is bounded by the TTL, IDEMPOTENCY_MAX_KEYS_PER_USER and
+# `manage.py purge_idempotency_keys`.
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def ttl():
+    return timedelta(seconds=getattr(settings, 'IDEMPOTENCY_KEY_TTL', 24 * 3600))
+
+
+def fingerprint(request):
+    """Hash of the parsed request data; uploaded files count by name and size."""
+    data = request.data
+    pairs = data.lists() if hasattr(data, 'lists') else ((name, [value]) for name, value in data.items())
+
+    def describe(value):
+        return [value.name, value.size] if isinstance(value, UploadedFile) else value
+
+    normalised = sorted((name, [describe(value) for value in values]) for name, values in pairs)
+    return hashlib.sha256(json.dumps(normalised, cls=JSONEncoder, sort_keys=True).encode()).hexdigest()
+
+
+def claim(user, route, key, digest):
+    """Insert the in-flight record; returns None when claimed, else the existing record."""
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            IdempotencyRecord.objects.create(user=user, route=route, key=key, fingerprint=digest, expires_at=now + ttl())
+        return None
+    except IntegrityError:
+        pass
+    record = IdempotencyRecord.objects.filter(user=user, route=route, key=key).first()
+    if record is None:
+        # Released meanwhile.
+        return claim(user, route, key, digest)
+    abandoned = now - timedelta(seconds=getattr(settings, 'IDEMPOTENCY_LOCK_SECONDS', 60))
+    if record.expires_at <= now or (record.status_code is None and record.created_at <= abandoned):
+        # Expired, or left in flight by a worker that died: drop it and claim afresh.
+        IdempotencyRecord.objects.filter(pk=record.pk, created_at=record.created_at).delete()
+        return claim(user, route, key, digest)
+    return record
+
+
+def trim(user):
+    """Drop the user's expired records and any beyond the newest IDEMPOTENCY_MAX_KEYS_PER_USER."""
+    IdempotencyRecord.objects.filter(user=user, expires_at__lte=timezone.now()).delete()
+    limit = getattr(settings, 'IDEMPOTENCY_MAX_KEYS_PER_USER', 1000)
+    overflow = list(
+        IdempotencyRecord.objects.filter(user=user).order_by('-created_at').values_list('pk', flat=True)[limit:limit + 100]
+    )
+    if overflow:
+        IdempotencyRecord.objects.filter(pk__in=overflow).delete()
+
+
+def replay(record):
+    response = Response(json.loads(record.response) if record.response else None, status=record.status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(handler):
+    """Decorate an authenticated APIView.post so Idempotency-Key retries replay the first response."""
+
+    @functools.wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None or not request.user.is_authenticated:
+            return handler(view, request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return Response({'error': f'{HEADER} must be 1-{MAX_KEY_LENGTH} characters'}, status=status.HTTP_400_BAD_REQUEST)
+
+        route = f'{request.method} {request.path}'
+        digest = fingerprint(request)
+        record = claim(request.user, route, key, digest)
+        if record is not None:
+            if record.fingerprint != digest:
+                return Response(
+                    {'error': f'{HEADER} was already used for a different request'},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+            if record.status_code is None:
+                # Answer at once rather than parking a worker until the original finishes.
+                response = Response({'error': 'The original request is still in progress'}, status=status.HTTP_409_CONFLICT)
+                response['Retry-After'] = '1'
+                return response
+            return replay(record)
+
+        trim(request.user)
+        try:
+            response = handler(view, request, *args, **kwargs)
+        except BaseException:
+            IdempotencyRecord.objects.filter(user=request.user, route=route, key=key).delete()
+            raise
+        if response.status_code >= 500:
+            IdempotencyRecord.objects.filter(user=request.user, route=route, key=key).delete()
+            return response
+        IdempotencyRecord.objects.filter(user=request.user, route=route, key=key).update(
+            status_code=response.status_code,
+            response=json.dumps(response.data, cls=JSONEncoder) if response.data is not None else '',
+        )
+        return response
+
+    return wrapper
+
+
+def purge_expired(batch_size=1000):
+    """Delete expired records in batches; returns how many were removed."""
+    removed = 0
+    while True:
+        ids = list(IdempotencyRecord.objects.filter(expires_at__lte=timezone.now()).values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return removed
+        removed += IdempotencyRecord.objects.filter(pk__in=ids).delete()[0]
@@ -0,0 +1,48 @@
+import os
+import threading
+import time
+import uuid
+
+# ============================================================
+# TIME-ORDERED IDS (UUIDv7)
+# ============================================================
+# RFC 9562 version 7: 48 bits of Unix milliseconds, then 12 bits used as a
+# per-millisecond counter and 62 random bits. New ids sort after older ones,
+# so inserts append to the primary key index and ORDER BY id is creation
+# order. Python 3.11 has no uuid.uuid7, hence this module.
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def _build(ms, counter, rand):
+    value = (ms & 0xFFFF_FFFF_FFFF) << 80 | 0x7 << 76 | (counter & 0xFFF) << 64 | 0b10 << 62 | rand
+    return uuid.UUID(int=value)
+
+
+def uuid7():
+    """A new UUIDv7, strictly increasing within this process."""
+    global _last_ms, _counter
+    rand = int.from_bytes(os.urandom(8), 'big') & ((1 << 62) - 1)
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _last_ms:
+            # Start low in the counter space so a busy millisecond rarely overflows it.
+            _last_ms, _counter = ms, rand >> 53
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                _last_ms, _counter = _last_ms + 1, 0
+        return _build(_last_ms, _counter, rand)
+
+
+def uuid7_at(moment):
+    """A UUIDv7 whose timestamp is the given aware datetime (for re-keying old rows)."""
+    rand = int.from_bytes(os.urandom(10), 'big')
+    return _build(int(moment.timestamp() * 1000), rand >> 62, rand & ((1 << 62) - 1))
+
+
+def uuid7_time(value):
+    """Unix milliseconds stored in a UUIDv7."""
+    return value.int >> 80
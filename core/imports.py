@@ -0,0 +1,215 @@
+import csv
+import io
+import json
+import re
+
+from django.db import transaction
+
+from .dedupe import index_jobs
+from .models import Job
+from .stats import record_jobs_posted
+from .serializers import JobCreateSerializer
+
+# ============================================================
+# BULK JOB IMPORT
+# ============================================================
+
+IMPORT_BATCH_SIZE = 500
+IMPORT_READ_SIZE = 64 * 1024
+MAX_REPORTED_ERRORS = 1000
+MAX_ROW_CHARS = 1_000_000
+
+_WHITESPACE = re.compile(r'\s*')
+
+
+class ImportFormatError(Exception):
+    """Raised when the upload itself cannot be parsed any further."""
+
+
+PARSE_ERRORS = (ImportFormatError, UnicodeDecodeError, csv.Error)
+
+
+def iter_json_array(text, read_size=IMPORT_READ_SIZE):
+    """
+    Yield the elements of a top-level JSON array, reading the stream in chunks.
+
+    Elements must be separated by exactly one comma and the array closed
+    with `]`; anything else raises ImportFormatError naming the row.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = '', 0, False
+
+    def fill():
+        nonlocal buffer, pos, eof
+        chunk = text.read(read_size)
+        eof = not chunk
+        buffer, pos = buffer[pos:] + chunk, 0
+
+    def peek():
+        """Next non-whitespace character (pos moves onto it), or None at the end of the upload."""
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer):
+                return buffer[pos]
+            if eof:
+                return None
+            fill()
+
+    first = peek()
+    if first is None:
+        raise ImportFormatError('Empty upload')
+    if first != '[':
+        raise ImportFormatError('Expected a JSON array')
+    pos += 1
+
+    row = 0
+    if peek() != ']':
+        while True:
+            if peek() in (',', ']', None):
+                raise ImportFormatError(f'Expected a value for row {row + 1}')
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof or len(buffer) - pos > MAX_ROW_CHARS:
+                    raise ImportFormatError(f'Malformed JSON in row {row + 1}')
+                fill()
+                continue
+            row += 1
+            yield item
+
+            separator = peek()
+            if separator == ',':
+                pos += 1
+            elif separator == ']':
+                break
+            elif separator is None:
+                raise ImportFormatError(f'Unterminated JSON array after row {row}')
+            else:
+                raise ImportFormatError(f'Expected "," or "]" after row {row}')
+    pos += 1
+    if peek() is not None:
+        raise ImportFormatError('Unexpected data after the JSON array')
+
+
+def iter_ndjson(text):
+    """Yield one decoded value per non-blank line."""
+    for line in text:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            raise ImportFormatError('Malformed JSON line')
+
+
+def iter_csv(text):
+    """Yield one dict per CSV data row, keyed by the header line."""
+    yield from csv.DictReader(text)
+
+
+IMPORT_FORMATS = {
+    'json': iter_json_array,
+    'ndjson': iter_ndjson,
+    'csv': iter_csv,
+}
+
+_EXTENSIONS = {
+    '.json': 'json',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.csv': 'csv',
+}
+
+
+def detect_format(upload, requested=None):
+    """Pick the parser from ?type=, then the file extension, then the content type."""
+    if requested:
+        return requested if requested in IMPORT_FORMATS else None
+    name = (upload.name or '').lower()
+    for extension, fmt in _EXTENSIONS.items():
+        if name.endswith(extension):
+            return fmt
+    content_type = (upload.content_type or '').lower()
+    if 'csv' in content_type:
+        return 'csv'
+    if 'ndjson' in content_type or 'jsonl' in content_type:
+        return 'ndjson'
+    if 'json' in content_type:
+        return 'json'
+    return None
+
+
+class JobImport:
+    """Validate uploaded rows in batches and bulk insert the valid ones."""
+
+    def __init__(self, employer, batch_size=IMPORT_BATCH_SIZE):
+        self.employer = employer
+        self.batch_size = batch_size
+        self.rows = 0
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def run(self, rows):
+        batch = []
+        try:
+            for row in rows:
+                self.rows += 1
+                batch.append((self.rows, row))
+                if len(batch) >= self.batch_size:
+                    self.flush(batch)
+                    batch = []
+        except PARSE_ERRORS:
+            # Keep the rows parsed before the upload went bad.
+            self.flush(batch)
+            raise
+        self.flush(batch)
+        return self
+
+    def flush(self, batch):
+        jobs = []
+        for number, row in batch:
+            if not isinstance(row, dict):
+                self.reject(number, {'non_field_errors': ['Expected an object']})
+                continue
+            serializer = JobCreateSerializer(data=row)
+            if serializer.is_valid():
+                jobs.append(Job(employer=self.employer, approved=False, **serializer.validated_data))
+            else:
+                self.reject(number, serializer.errors)
+
+        if jobs:
+            with transaction.atomic():
+                Job.objects.bulk_create(jobs)
+                index_jobs(jobs)
+                record_jobs_posted(jobs)
+            self.created += len(jobs)
+
+    def reject(self, number, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': number, 'errors': errors})
+
+    def summary(self):
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+        }
+
+
+def import_jobs(employer, upload, fmt, batch_size=IMPORT_BATCH_SIZE):
+    """Stream-parse an uploaded file and import its rows; returns (JobImport, parse error or None)."""
+    job_import = JobImport(employer, batch_size)
+    text = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    try:
+        job_import.run(IMPORT_FORMATS[fmt](text))
+        error = None
+    except PARSE_ERRORS as exc:
+        error = str(exc)
+    finally:
+        text.detach()
+    return job_import, error
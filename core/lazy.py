@@ -0,0 +1,24 @@
+from django.utils.module_loading import import_string
+
+# ============================================================
+# LAZY VIEWS
+# ============================================================
+
+def lazy_view(import_path, **initkwargs):
+    """
+    URL callback that imports a class-based view on its first request.
+
+    Keeps rarely used, import-heavy views (schema and docs) out of worker boot.
+    Only use it for DRF views, which are CSRF exempt anyway.
+    """
+    view = None
+
+    def dispatch(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(import_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    dispatch.csrf_exempt = True
+    dispatch.lazy_import_path = import_path
+    return dispatch
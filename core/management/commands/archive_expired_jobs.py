@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.retention import archive_expired, expired_jobs, retention_cutoff
+
+
+class Command(BaseCommand):
+    help = "Move jobs past the retention period, and their applications, into the archive tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help="Override settings.JOB_RETENTION_DAYS")
+        parser.add_argument('--batch-size', type=int, default=200, help="Rows moved per transaction")
+        parser.add_argument('--pause', type=float, default=0.05, help="Seconds to sleep between transactions")
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        cutoff = retention_cutoff(options['days'])
+        if options['dry_run']:
+            count = expired_jobs(cutoff).count()
+            self.stdout.write(self.style.NOTICE(f"{count} jobs created before {cutoff:%Y-%m-%d} would be archived"))
+            return
+
+        self.stdout.write(self.style.NOTICE(f"Archiving jobs created before {cutoff:%Y-%m-%d}..."))
+        start = time.perf_counter()
+
+        def progress(jobs, applications):
+            self.stdout.write(f"  archived {jobs} jobs, {applications} applications")
+
+        jobs, applications = archive_expired(cutoff, options['batch_size'], options['pause'], on_batch=progress)
+        self.stdout.write(self.style.SUCCESS(
+            f"✔ Archived {jobs} jobs and {applications} applications in {time.perf_counter() - start:.1f}s"
+        ))
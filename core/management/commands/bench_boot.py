@@ -0,0 +1,47 @@
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Measure cold-boot time to the first served request for each settings profile"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entry', choices=['wsgi', 'asgi'], default='wsgi')
+        parser.add_argument('--path', default='/api/jobs/')
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--profiles', nargs='+', default=['zou_jobfinder.settings', 'zou_jobfinder.settings_api'])
+
+    def handle(self, *args, **options):
+        for profile in options['profiles']:
+            results = [self.boot_once(profile, options) for _ in range(options['runs'])]
+            summary = {
+                key: statistics.median(result[key] for result in results)
+                for key in ('process_ms', 'import_ms', 'first_request_ms', 'boot_to_first_response_ms', 'modules')
+            }
+            self.stdout.write(self.style.SUCCESS(
+                f"{profile}: process {summary['process_ms']:.0f} ms | import {summary['import_ms']:.0f} ms | "
+                f"first request {summary['first_request_ms']:.0f} ms | boot to first response "
+                f"{summary['boot_to_first_response_ms']:.0f} ms | {summary['modules']:.0f} modules "
+                f"(median of {options['runs']})"
+            ))
+
+    def boot_once(self, profile, options):
+        command = [
+            sys.executable, '-m', 'core.boot', '--settings', profile,
+            '--entry', options['entry'], '--path', options['path'],
+        ]
+        start = time.perf_counter()
+        result = subprocess.run(command, cwd=settings.BASE_DIR, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            raise CommandError(result.stderr[-2000:])
+        timings = json.loads(result.stdout)
+        # Includes interpreter start-up, which the in-process timings cannot see.
+        timings['process_ms'] = elapsed * 1000
+        return timings
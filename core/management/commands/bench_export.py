@@ -0,0 +1,98 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from rest_framework.renderers import JSONRenderer
+
+from core.benchmarks import bench_database, make_applications, make_employer, make_jobs, make_students, peak_rss_mb
+from core.exports import EXPORT_FORMATS, applicant_queryset
+from core.models import Application, Job
+from core.serializers import ApplicationSerializer
+
+
+class Command(BaseCommand):
+    help = "Compare peak RSS and time-to-first-byte of the streaming applicant export against the JSON list"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--applications', type=int, default=100_000)
+        parser.add_argument('--skip-json', action='store_true', help="Skip the in-memory JSON baseline")
+        # Used by the per-format subprocesses.
+        parser.add_argument('--measure', help=argparse.SUPPRESS)
+        parser.add_argument('--job', help=argparse.SUPPRESS)
+        parser.add_argument('--database', help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options['measure']:
+            return self.measure(options['measure'], options['job'], options['database'])
+
+        count = options['applications']
+        formats = list(EXPORT_FORMATS) + ([] if options['skip_json'] else ['json'])
+        # Seeding 100k rows costs far more memory than exporting them, so each
+        # format runs in a fresh process that only boots Django and exports.
+        with bench_database(shared=True):
+            self.stdout.write(self.style.NOTICE(f"Seeding {count} applications..."))
+            employer = make_employer()
+            job = make_jobs(employer, 1)[0]
+            make_applications(job, make_students(count))
+            database = str(connections['default'].settings_dict['NAME'])
+            for name in formats:
+                self.report(name, self.run_format(name, job, database))
+
+    def run_format(self, name, job, database):
+        command = [
+            sys.executable, 'manage.py', 'bench_export',
+            '--measure', name, '--job', str(job.pk), '--database', database,
+        ]
+        result = subprocess.run(command, cwd=settings.BASE_DIR, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise CommandError(result.stderr[-2000:])
+        return json.loads(result.stdout)
+
+    def report(self, name, result):
+        label = 'json (baseline)' if name == 'json' else name
+        self.stdout.write(self.style.SUCCESS(
+            f"{label:>16}: first byte {result['first_byte'] * 1000:8.2f} ms | total {result['total']:6.2f} s | "
+            f"{result['size'] / 1e6:7.1f} MB out | peak RSS {result['peak_rss_mb']:7.1f} MB "
+            f"(+{result['peak_rss_mb'] - result['boot_rss_mb']:.1f} MB over boot)"
+        ))
+
+    def measure(self, name, job_id, database):
+        connection = connections['default']
+        connection.close()
+        connection.settings_dict['NAME'] = database
+        job = Job.objects.get(pk=job_id)
+        boot_rss = peak_rss_mb()
+        start = time.perf_counter()
+        if name == 'json':
+            first_byte, size = self.serialize_all(job)
+        else:
+            first_byte, size = self.consume(EXPORT_FORMATS[name][2](applicant_queryset(job)))
+        result = {
+            'first_byte': first_byte,
+            'total': time.perf_counter() - start,
+            'size': size,
+            'boot_rss_mb': boot_rss,
+            'peak_rss_mb': peak_rss_mb(),
+        }
+        self.stdout.write(json.dumps(result))
+
+    def consume(self, chunks):
+        start = time.perf_counter()
+        first_byte = None
+        size = 0
+        for chunk in chunks:
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            size += len(chunk)
+        return first_byte or 0.0, size
+
+    def serialize_all(self, job):
+        start = time.perf_counter()
+        data = ApplicationSerializer(Application.objects.filter(job=job), many=True).data
+        body = JSONRenderer().render(data)
+        return time.perf_counter() - start, len(body)
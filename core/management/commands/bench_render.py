@@ -0,0 +1,60 @@
+import gzip
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from core.benchmarks import bench_database, make_applications, make_employer, make_jobs, make_students
+from core.middleware import brotli
+from core.models import Application, Job
+from core.renderers import FastJSONRenderer
+from core.serializers import ApplicationSerializer, JobSerializer
+
+
+class Command(BaseCommand):
+    help = "Report encode time and bytes on the wire for job and application list responses"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+
+        with bench_database():
+            employer = make_employer()
+            jobs = make_jobs(employer, rows)
+            make_applications(jobs[0], make_students(rows))
+
+            payloads = {
+                'jobs': JobSerializer(
+                    JobSerializer.sparse_queryset(Job.objects.all()), many=True
+                ).data,
+                'applications': ApplicationSerializer(
+                    ApplicationSerializer.sparse_queryset(Application.objects.all()), many=True
+                ).data,
+            }
+
+        renderers = {'stdlib': JSONRenderer(), 'fast': FastJSONRenderer()}
+        if FastJSONRenderer.backend is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed; 'fast' falls back to stdlib"))
+
+        for name, data in payloads.items():
+            self.stdout.write(self.style.NOTICE(f"{name} ({rows} rows)"))
+            for label, renderer in renderers.items():
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    body = renderer.render(data)
+                elapsed = (time.perf_counter() - start) / repeat
+                self.stdout.write(f"  {label:>6} encode: {elapsed * 1000:8.2f} ms")
+
+            self.stdout.write(f"  identity: {len(body):>10,} bytes")
+            self.report_compression('gzip', lambda: gzip.compress(body, compresslevel=6))
+            if brotli is not None:
+                self.report_compression('br', lambda: brotli.compress(body, quality=4))
+
+    def report_compression(self, label, compress):
+        start = time.perf_counter()
+        compressed = compress()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f"  {label:>8}: {len(compressed):>10,} bytes ({elapsed * 1000:.2f} ms)")
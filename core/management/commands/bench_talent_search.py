@@ -0,0 +1,62 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.benchmarks import bench_database, make_applications, make_employer, make_jobs, make_students
+from core.models import Resume
+from core.search import FTS_TABLE, SKILL_VOCABULARY, extract_skills, fts_rowid, search_talent
+
+FILLER = (
+    'experienced motivated graduate team player responsible for delivering projects on time '
+    'worked with stakeholders to improve processes and reporting across departments'
+).split()
+
+
+class Command(BaseCommand):
+    help = "Time ranked talent search over a synthetic set of indexed resumes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resumes', type=int, default=20_000)
+        parser.add_argument('--queries', type=int, default=200)
+
+    def handle(self, *args, **options):
+        count = options['resumes']
+        rng = random.Random(42)
+
+        with bench_database():
+            self.stdout.write(self.style.NOTICE(f"Seeding and indexing {count} resumes..."))
+            employer = make_employer()
+            students = make_students(count)
+            make_applications(make_jobs(employer, 1)[0], students)
+
+            resumes = []
+            for student in students:
+                words = rng.choices(FILLER, k=150) + rng.sample(SKILL_VOCABULARY, 6)
+                rng.shuffle(words)
+                text = ' '.join(words)
+                resumes.append(Resume(student=student, file='resumes/bench.pdf', text=text, skills=extract_skills(text)))
+            Resume.objects.bulk_create(resumes, batch_size=5000)
+
+            start = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f'INSERT INTO {FTS_TABLE} (rowid, student_id, resume_id, text, skills) VALUES (%s, %s, %s, %s, %s)',
+                    [(fts_rowid(r.student_id), r.student_id.hex, r.id.hex, r.text, r.skills) for r in resumes],
+                )
+            self.stdout.write(f"Indexed in {time.perf_counter() - start:.2f}s")
+
+            timings = []
+            for _ in range(options['queries']):
+                query = ' '.join(rng.sample(SKILL_VOCABULARY, 2))
+                start = time.perf_counter()
+                search_talent(employer, query, limit=20)
+                timings.append((time.perf_counter() - start) * 1000)
+
+        timings.sort()
+        self.stdout.write(self.style.SUCCESS(
+            f"{options['queries']} queries over {count} resumes: median {statistics.median(timings):.2f} ms, "
+            f"p95 {timings[int(len(timings) * 0.95) - 1]:.2f} ms, max {timings[-1]:.2f} ms"
+        ))
@@ -0,0 +1,59 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import AnonRateThrottle
+
+from core import throttling
+from core.throttling import CacheBucketStore, IPBucketThrottle, LocalBucketStore
+
+BENCH_RATE = '1000000/min'
+
+
+class BenchView:
+    throttle_scope = 'bench'
+
+
+class BenchAnonRateThrottle(AnonRateThrottle):
+    rate = BENCH_RATE
+
+
+class Command(BaseCommand):
+    help = "Measure the per-request cost of the token bucket throttles against DRF's cache throttle"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200_000)
+        parser.add_argument('--clients', type=int, default=1000, help="Distinct client IPs cycled through")
+
+    def handle(self, *args, **options):
+        count, clients = options['requests'], options['clients']
+        factory = APIRequestFactory()
+        requests = [
+            Request(factory.post('/api/login/', REMOTE_ADDR=f'10.0.{i // 256}.{i % 256}'))
+            for i in range(clients)
+        ]
+        view = BenchView()
+        rates = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {'bench_ip': BENCH_RATE}}
+
+        with override_settings(REST_FRAMEWORK=rates):
+            for label, store in (('local', LocalBucketStore()), ('cache', CacheBucketStore())):
+                throttling._store = store
+                self.report(f"token bucket ({label})", count, requests,
+                            lambda request: IPBucketThrottle().allow_request(request, view))
+        throttling.reset_bucket_store()
+
+        self.report("DRF AnonRateThrottle", count, requests,
+                    lambda request: BenchAnonRateThrottle().allow_request(request, view))
+
+    def report(self, label, count, requests, check):
+        clients = len(requests)
+        start = time.perf_counter()
+        for i in range(count):
+            check(requests[i % clients])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"{label:>24}: {elapsed / count * 1e6:6.2f} µs/request ({count / elapsed:,.0f} checks/s)"
+        ))
@@ -0,0 +1,85 @@
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand
+
+from core.ids import uuid7_at
+
+# Mirrors the SQLite layout Django gives core_job: char(32) hex UUID primary
+# key (a separate unique index next to the rowid) and a created_at column.
+SCHEMA = """
+CREATE TABLE job (
+    id char(32) NOT NULL PRIMARY KEY,
+    employer_id char(32) NOT NULL,
+    title varchar(200) NOT NULL,
+    created_at datetime NOT NULL
+)
+"""
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class Command(BaseCommand):
+    help = "Compare random (v4) and time-ordered (v7) UUID primary keys on a scratch SQLite database"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000)
+        parser.add_argument('--batch-size', type=int, default=10_000, help="Rows inserted per transaction")
+        parser.add_argument('--pages', type=int, default=2000, help="Keyset pages fetched from random cursors")
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--cache-mb', type=int, default=16, help="SQLite page cache (smaller than the index)")
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmp:
+            for kind in ('v4', 'v7'):
+                self.run(kind, os.path.join(tmp, f'{kind}.sqlite3'), options)
+
+    def run(self, kind, path, options):
+        rows, batch_size = options['rows'], options['batch_size']
+        db = sqlite3.connect(path, isolation_level=None)
+        db.execute(f"PRAGMA cache_size = -{options['cache_mb'] * 1024}")
+        db.execute(SCHEMA)
+        if kind == 'v4':
+            # Random ids cannot be paged in creation order, so v4 needs this extra index.
+            db.execute('CREATE INDEX job_created_at ON job (created_at, id)')
+        employer = uuid.uuid4().hex
+
+        start = time.perf_counter()
+        for offset in range(0, rows, batch_size):
+            batch = []
+            for i in range(offset, min(offset + batch_size, rows)):
+                created = BASE_TIME + timedelta(milliseconds=i)
+                job_id = uuid.uuid4() if kind == 'v4' else uuid7_at(created)
+                batch.append((job_id.hex, employer, 'Software Engineer', created.isoformat(' ')))
+            db.execute('BEGIN')
+            db.executemany('INSERT INTO job VALUES (?, ?, ?, ?)', batch)
+            db.execute('COMMIT')
+        insert_s = time.perf_counter() - start
+
+        indexes = db.execute(
+            "SELECT SUM(pgsize), SUM(unused) * 1.0 / SUM(pgsize) FROM dbstat "
+            "WHERE name IN ('sqlite_autoindex_job_1', 'job_created_at')"
+        ).fetchone()
+        index_mb, index_free = indexes[0] / 2 ** 20, indexes[1]
+
+        if kind == 'v4':
+            cursors = db.execute('SELECT created_at, id FROM job ORDER BY random() LIMIT ?', [options['pages']]).fetchall()
+            sql = 'SELECT * FROM job WHERE (created_at, id) > (?, ?) ORDER BY created_at, id LIMIT ?'
+        else:
+            cursors = db.execute('SELECT id FROM job ORDER BY random() LIMIT ?', [options['pages']]).fetchall()
+            sql = 'SELECT * FROM job WHERE id > ? ORDER BY id LIMIT ?'
+        random.shuffle(cursors)
+        start = time.perf_counter()
+        for cursor in cursors:
+            db.execute(sql, [*cursor, options['page_size']]).fetchall()
+        page_ms = (time.perf_counter() - start) / len(cursors) * 1000
+
+        db.close()
+        self.stdout.write(self.style.SUCCESS(
+            f"{kind}: insert {rows / insert_s:,.0f} rows/s | indexes {index_mb:.1f} MB ({index_free:.0%} free space) "
+            f"| file {os.path.getsize(path) / 2 ** 20:.1f} MB | keyset page {page_ms:.3f} ms"
+        ))
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.dedupe import clear_index, duplicate_clusters, index_jobs
+from core.models import Job
+
+
+class Command(BaseCommand):
+    help = "Group existing jobs into clusters of near-duplicate postings using the MinHash/LSH index"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help="Recompute every job's signature first")
+        parser.add_argument('--threshold', type=float, default=None, help="Override settings.DUPLICATE_JOB_THRESHOLD")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Jobs indexed per transaction")
+        parser.add_argument('--show', type=int, default=20, help="Clusters to print, largest first")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        if options['rebuild']:
+            clear_index()
+            jobs = Job.objects.only('id', 'title', 'description', 'skills').order_by('pk')
+            indexed = 0
+            batch = []
+            for job in jobs.iterator(chunk_size=options['batch_size']):
+                batch.append(job)
+                if len(batch) >= options['batch_size']:
+                    indexed += len(index_jobs(batch))
+                    batch = []
+            indexed += len(index_jobs(batch))
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f"Indexed {indexed} jobs in {elapsed:.1f}s ({indexed / max(elapsed, 1e-9):.0f} jobs/s)")
+
+        clusters = duplicate_clusters(options['threshold'])
+        shown = clusters[:options['show']]
+        titles = dict(Job.objects.filter(pk__in=[members[0] for members in shown]).values_list('id', 'title'))
+        for members in shown:
+            ids = ', '.join(str(job_id) for job_id in members[:5]) + (' ...' if len(members) > 5 else '')
+            self.stdout.write(f"  {len(members):>5} x {titles.get(members[0], '?')!r}: {ids}")
+        duplicates = sum(len(members) - 1 for members in clusters)
+        self.stdout.write(self.style.SUCCESS(
+            f"✔ {len(clusters)} clusters, {duplicates} redundant postings ({time.perf_counter() - start:.1f}s)"
+        ))
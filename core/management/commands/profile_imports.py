@@ -0,0 +1,61 @@
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def parse_importtime(output):
+    """Return (module, self_us, cumulative_us, depth) for each `-X importtime` line."""
+    rows = []
+    for line in output.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Break down the import time of a cold worker boot (WSGI/ASGI entry point plus first request)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entry', choices=['wsgi', 'asgi'], default='wsgi')
+        parser.add_argument('--path', default='/api/jobs/', help="Request served after boot (pulls in the URLconf)")
+        parser.add_argument('--profile-settings', default=None,
+                            help="Settings module to boot with, e.g. zou_jobfinder.settings_api")
+        parser.add_argument('--top', type=int, default=25)
+
+    def handle(self, *args, **options):
+        command = [
+            sys.executable, '-X', 'importtime', '-m', 'core.boot',
+            '--entry', options['entry'], '--path', options['path'],
+        ]
+        if options['profile_settings']:
+            command += ['--settings', options['profile_settings']]
+        result = subprocess.run(command, cwd=settings.BASE_DIR, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise CommandError(result.stderr[-2000:])
+
+        rows = parse_importtime(result.stderr)
+        total_us = sum(self_us for _, self_us, _, _ in rows)
+        self.stdout.write(self.style.NOTICE(
+            f"{len(rows)} modules imported in {total_us / 1000:.1f} ms (boot result: {result.stdout})"
+        ))
+
+        packages = defaultdict(int)
+        for module, self_us, _, _ in rows:
+            packages[module.split('.')[0]] += self_us
+
+        self.stdout.write(self.style.SUCCESS("\nBy top-level package (self time)"))
+        for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f"  {self_us / 1000:8.1f} ms  {self_us / total_us:6.1%}  {package}")
+
+        self.stdout.write(self.style.SUCCESS("\nBy module (cumulative time, outermost imports)"))
+        outermost = [row for row in rows if row[3] <= 1]
+        for module, _, cumulative_us, _ in sorted(outermost, key=lambda row: -row[2])[:options['top']]:
+            self.stdout.write(f"  {cumulative_us / 1000:8.1f} ms  {module}")
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.search import clear_index, latest_resumes, process_resume, search_supported
+
+
+class Command(BaseCommand):
+    help = "Rebuild the talent search index from each student's latest resume"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reextract', action='store_true',
+                            help="Extract text from the stored files again, even for resumes already processed")
+
+    def handle(self, *args, **options):
+        if not search_supported():
+            raise CommandError("Talent search needs SQLite FTS5")
+
+        start = time.perf_counter()
+        clear_index()
+        count = 0
+        for resume in latest_resumes():
+            try:
+                process_resume(resume, extract=options['reextract'] or not resume.text)
+            except OSError as exc:
+                self.stdout.write(self.style.WARNING(f"Skipped resume {resume.id}: {exc}"))
+                continue
+            count += 1
+            if count % 1000 == 0:
+                self.stdout.write(f"  indexed {count} resumes")
+
+        self.stdout.write(self.style.SUCCESS(f"✔ Indexed {count} resumes in {time.perf_counter() - start:.1f}s"))
@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.rekey import REKEY_MODELS, rekey_model
+
+
+class Command(BaseCommand):
+    help = "Rewrite random (v4) primary keys of jobs, applications and resumes to time-ordered v7 ids"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=REKEY_MODELS, action='append', help="Only these models (repeatable)")
+        parser.add_argument('--batch-size', type=int, default=500, help="Rows re-keyed per transaction")
+
+    def handle(self, *args, **options):
+        for name in options['model'] or REKEY_MODELS:
+            start = time.perf_counter()
+            self.stdout.write(self.style.NOTICE(f"Re-keying {name} rows..."))
+            count = rekey_model(name, options['batch_size'], on_batch=lambda total: self.stdout.write(f"  {total} rows"))
+            self.stdout.write(self.style.SUCCESS(f"✔ {count} {name} rows re-keyed in {time.perf_counter() - start:.1f}s"))
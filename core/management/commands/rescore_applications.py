@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.models import Application, RescoreQueue
+from core.scoring import SCORE_BATCH_SIZE, drain, rescore_all
+
+
+class Command(BaseCommand):
+    help = "Recompute stale application match scores from the rescoring queue, or all of them with --all"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Rescore every application, not just queued pairs")
+        parser.add_argument('--batch-size', type=int, default=SCORE_BATCH_SIZE, help="Applications scored per batch")
+        parser.add_argument('--limit', type=int, default=None, help="Stop after this many queued pairs")
+
+    def handle(self, *args, **options):
+        if options['all']:
+            total = Application.objects.count()
+            label = 'applications'
+        else:
+            total = RescoreQueue.objects.count()
+            if options['limit'] is not None:
+                total = min(total, options['limit'])
+            label = 'queued pairs'
+        self.stdout.write(self.style.NOTICE(f"Rescoring {total} {label}..."))
+        start = time.perf_counter()
+
+        def progress(done, updated):
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"  {done}/{total} ({done / max(total, 1):.0%}), {updated} updated, {done / max(elapsed, 1e-9):,.0f}/s"
+            )
+
+        if options['all']:
+            done, updated = rescore_all(options['batch_size'], on_batch=progress)
+        else:
+            done, updated = drain(options['limit'], options['batch_size'], on_batch=progress)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"✔ {done} {label} rescored, {updated} changed in {elapsed:.1f}s ({done / max(elapsed, 1e-9):,.0f}/s)"
+        ))
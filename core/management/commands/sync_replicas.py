@@ -0,0 +1,37 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.replicas import replica_aliases
+
+
+class Command(BaseCommand):
+    help = "Copy the primary SQLite database onto the replica SQLite files (local replica testing)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=None, help="Keep syncing every N seconds")
+
+    def handle(self, *args, **options):
+        primary = settings.DATABASES['default']
+        aliases = replica_aliases()
+        if not aliases:
+            raise CommandError("No DATABASE_REPLICAS configured (set DB_REPLICAS=N for local replica files)")
+        for alias in ('default', *aliases):
+            if settings.DATABASES[alias]['ENGINE'] != 'django.db.backends.sqlite3':
+                raise CommandError(f"{alias} is not SQLite; use the database's own replication")
+
+        while True:
+            for alias in aliases:
+                start = time.perf_counter()
+                connections[alias].close()
+                # The backup API copies a consistent snapshot while the primary stays writable.
+                with sqlite3.connect(primary['NAME']) as source, sqlite3.connect(settings.DATABASES[alias]['NAME']) as target:
+                    source.backup(target)
+                self.stdout.write(f"  {alias} synced in {(time.perf_counter() - start) * 1000:.0f} ms")
+            if options['interval'] is None:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(f"✔ {len(aliases)} replicas in sync"))
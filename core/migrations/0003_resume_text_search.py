@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:31
+
+from django.db import migrations, models
+
+
+def create_resume_fts(apps, schema_editor):
+    # FTS5 only exists on SQLite; talent search is disabled on other backends.
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS core_resume_fts USING fts5("
+        "student_id UNINDEXED, resume_id UNINDEXED, text, skills, "
+        "tokenize='porter unicode61')"
+    )
+
+
+def drop_resume_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS core_resume_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_archivedjob_archivedapplication'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='skills',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='text',
+            field=models.TextField(blank=True),
+        ),
+        migrations.RunPython(create_resume_fts, drop_resume_fts),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:44
+
+import core.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_job_duplicate_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LegacyId',
+            fields=[
+                ('old_id', models.UUIDField(primary_key=True, serialize=False)),
+                ('new_id', models.UUIDField()),
+                ('model', models.CharField(max_length=30)),
+            ],
+        ),
+        # The default is applied in Python, so only the migration state changes;
+        # a plain AlterField would make SQLite rebuild all three tables.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='application',
+                    name='id',
+                    field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name='job',
+                    name='id',
+                    field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name='resume',
+                    name='id',
+                    field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 20:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_idempotency_records'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('jobs_posted', 'Jobs posted'), ('jobs_approved', 'Jobs approved'), ('applications', 'Applications')], max_length=20)),
+                ('dimension', models.CharField(blank=True, choices=[('', 'Total'), ('location', 'Location'), ('employer', 'Employer')], max_length=10)),
+                ('value', models.CharField(blank=True, max_length=100)),
+                ('day', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['metric', 'dimension', 'day'], name='stat_rollup_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('metric', 'dimension', 'value', 'day'), name='unique_stat_rollup')],
+            },
+        ),
+    ]
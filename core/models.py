@@ -2,6 +2,8 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser
 import uuid
 
+from .ids import uuid7
+
 class User(AbstractUser):
     ROLE_CHOICES = [
         ('student', 'Student'),
@@ -11,8 +13,15 @@ class User(AbstractUser):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='student')
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['role'], name='user_role_idx'),
+            # Exact email lookups from the admin searches
+            models.Index(fields=['email'], name='user_email_idx'),
+        ]
+
 class Job(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     employer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='jobs')
     title = models.CharField(max_length=200)
     description = models.TextField()
@@ -22,18 +31,159 @@ class Job(models.Model):
     approved = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Newest-first listings, optionally filtered by approval (admin and pending queue)
+        indexes = [
+            models.Index(fields=['-created_at'], name='job_created_idx'),
+            models.Index(fields=['approved', '-created_at'], name='job_approved_created_idx'),
+            models.Index(fields=['title'], name='job_title_idx'),
+        ]
+
 class Application(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     job = models.ForeignKey(Job, on_delete=models.CASCADE)
     student = models.ForeignKey(User, on_delete=models.CASCADE)
     status = models.CharField(max_length=20, default='Pending')
     match_score = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at'], name='application_created_idx'),
+            models.Index(fields=['status', '-created_at'], name='application_status_created_idx'),
+        ]
+
 class Resume(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     student = models.ForeignKey(User, on_delete=models.CASCADE)
     file = models.FileField(upload_to='resumes/')
     resume_score = models.IntegerField(default=0)
     feedback = models.TextField(blank=True)
+    # Filled in by core.search.process_resume and indexed for talent search
+    text = models.TextField(blank=True)
+    skills = models.CharField(max_length=255, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['-uploaded_at'], name='resume_uploaded_idx')]
+
+# ============================================================
+# LEGACY IDS
+# ============================================================
+# Jobs, applications and resumes re-keyed from random (v4) to time-ordered
+# (v7) ids by the rekey_uuid7 command. URLs still carrying an old id are
+# translated by core.converters.RecordIdConverter.
+
+class LegacyId(models.Model):
+    old_id = models.UUIDField(primary_key=True)
+    new_id = models.UUIDField()
+    model = models.CharField(max_length=30)
+
+# ============================================================
+# ARCHIVE
+# ============================================================
+# Expired jobs and their applications are moved here by the
+# archive_expired_jobs command so the live tables stay small.
+
+class ArchivedJob(models.Model):
+    id = models.UUIDField(primary_key=True, editable=False)
+    employer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_jobs')
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    location = models.CharField(max_length=100, blank=True)
+    duration = models.CharField(max_length=50, blank=True)
+    skills = models.CharField(max_length=255, blank=True)
+    approved = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+class ArchivedApplication(models.Model):
+    id = models.UUIDField(primary_key=True, editable=False)
+    job = models.ForeignKey(ArchivedJob, on_delete=models.CASCADE, related_name='applications')
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_applications')
+    status = models.CharField(max_length=20, default='Pending')
+    match_score = models.IntegerField(default=0)
+    # The student's latest resume when the application was archived
+    resume_file = models.FileField(upload_to='resumes/', blank=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+# ============================================================
+# DUPLICATE DETECTION
+# ============================================================
+# MinHash signatures of every job plus their LSH band buckets, maintained
+# by core.dedupe. Jobs sharing a bucket are duplicate candidates.
+
+class JobSignature(models.Model):
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='signature')
+    minhash = models.BinaryField()
+
+class JobLSHBucket(models.Model):
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='lsh_buckets')
+    bucket = models.BigIntegerField(db_index=True)
+
+# ============================================================
+# RESCORING QUEUE
+# ============================================================
+# (job, student) pairs whose Application.match_score is stale, drained by
+# core.scoring. The unique constraint dedupes repeated changes.
+
+class RescoreQueue(models.Model):
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='+')
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    queued_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['job', 'student'], name='unique_rescore_pair')]
+
+# ============================================================
+# IDEMPOTENCY KEYS
+# ============================================================
+# The first response to a POST carrying an Idempotency-Key header, replayed
+# to retries of the same user, route and key until it expires (core.idempotency).
+
+class IdempotencyRecord(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    route = models.CharField(max_length=255)
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    # Null while the first request is still running
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['user', 'route', 'key'], name='unique_idempotency_key')]
+        indexes = [models.Index(fields=['user', '-created_at'], name='idempotency_user_created_idx')]
+
+# ============================================================
+# ANALYTICS ROLLUPS
+# ============================================================
+# Per-day event counts for admin reporting, maintained by core.stats. The
+# platform total has an empty dimension; per-location and per-employer
+# counts carry the location or employer id in `value`.
+
+class StatRollup(models.Model):
+    METRIC_CHOICES = [
+        ('jobs_posted', 'Jobs posted'),
+        ('jobs_approved', 'Jobs approved'),
+        ('applications', 'Applications'),
+    ]
+    DIMENSION_CHOICES = [
+        ('', 'Total'),
+        ('location', 'Location'),
+        ('employer', 'Employer'),
+    ]
+    metric = models.CharField(max_length=20, choices=METRIC_CHOICES)
+    dimension = models.CharField(max_length=10, choices=DIMENSION_CHOICES, blank=True)
+    value = models.CharField(max_length=100, blank=True)
+    day = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'dimension', 'value', 'day'], name='unique_stat_rollup'),
+        ]
+        # Grouped range queries: every value of a dimension over a span of days
+        indexes = [models.Index(fields=['metric', 'dimension', 'day'], name='stat_rollup_day_idx')]
@@ -0,0 +1,33 @@
+from django.apps import apps
+
+# ============================================================
+# OPENAPI EXTRAS
+# ============================================================
+# Views describe their extra OpenAPI details with document() and param(),
+# which take plain data. They only become drf-spectacular's extend_schema
+# when drf_spectacular is installed, so the API-only profile
+# (settings_api) never imports the schema stack.
+
+
+def param(name, type=str, **kwargs):
+    """A query parameter; `type` is a Python type or an OpenApiTypes name such as 'DATE'."""
+    return {'name': name, 'type': type, **kwargs}
+
+
+def document(parameters=(), **kwargs):
+    """Class decorator applying extend_schema(parameters=..., **kwargs) when drf_spectacular is installed."""
+
+    def decorate(view):
+        if not apps.is_installed('drf_spectacular'):
+            return view
+        from drf_spectacular.types import OpenApiTypes
+        from drf_spectacular.utils import OpenApiParameter, extend_schema
+
+        built = [
+            OpenApiParameter(**{**spec, 'type': getattr(OpenApiTypes, spec['type'])})
+            if isinstance(spec['type'], str) else OpenApiParameter(**spec)
+            for spec in parameters
+        ]
+        return extend_schema(parameters=built, **kwargs)(view)
+
+    return decorate
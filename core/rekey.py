@@ -0,0 +1,62 @@
+from django.db import transaction
+
+from .ids import uuid7_at
+from .models import Application, Job, LegacyId, Resume
+from .search import rename_indexed_resume
+
+# ============================================================
+# RE-KEYING OLD ROWS TO UUIDv7
+# ============================================================
+# Rows created before ids became time-ordered keep their random v4 id until
+# `manage.py rekey_uuid7` rewrites it to a v7 id carrying the row's own
+# creation time, so ORDER BY id matches history. Foreign keys pointing at
+# the row are moved in the same transaction (they are deferred constraints)
+# and the old id is kept in LegacyId for URLs issued before the switch.
+
+REKEY_MODELS = {
+    'job': (Job, 'created_at'),
+    'application': (Application, 'created_at'),
+    'resume': (Resume, 'uploaded_at'),
+}
+
+
+def rekey_batch(model, rows):
+    """Give each (old id, created time) row a v7 id; returns how many rows moved."""
+    relations = [relation for relation in model._meta.related_objects if not relation.many_to_many]
+    mapping = {old_id: uuid7_at(moment) for old_id, moment in rows}
+    with transaction.atomic():
+        for old_id, new_id in mapping.items():
+            model.objects.filter(pk=old_id).update(**{model._meta.pk.attname: new_id})
+            for relation in relations:
+                attname = relation.field.attname
+                relation.related_model.objects.filter(**{attname: old_id}).update(**{attname: new_id})
+        if model is Resume:
+            students = dict(Resume.objects.filter(pk__in=mapping.values()).values_list('pk', 'student_id'))
+            for old_id, new_id in mapping.items():
+                rename_indexed_resume(students[new_id], old_id, new_id)
+        LegacyId.objects.bulk_create(
+            [LegacyId(old_id=old_id, new_id=new_id, model=model._meta.model_name) for old_id, new_id in mapping.items()],
+            ignore_conflicts=True,
+        )
+    return len(mapping)
+
+
+def rekey_model(name, batch_size=500, on_batch=None):
+    """Re-key every non-v7 row of one model, walking the primary key in batches."""
+    model, time_field = REKEY_MODELS[name]
+    total = 0
+    last = None
+    while True:
+        queryset = model.objects.order_by('pk')
+        if last is not None:
+            queryset = queryset.filter(pk__gt=last)
+        page = list(queryset.values_list('pk', time_field)[:batch_size])
+        if not page:
+            return total
+        last = page[-1][0]
+        # Rows already re-keyed may sort after the cursor again; they are v7 and skipped.
+        rows = [(pk, moment) for pk, moment in page if pk.version != 7]
+        if rows:
+            total += rekey_batch(model, rows)
+            if on_batch:
+                on_batch(total)
@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# ============================================================
+# FAST JSON RENDERING / PARSING
+# ============================================================
+# settings.JSON_BACKEND picks the encoder: "orjson", "stdlib", or "auto"
+# (orjson when it is installed, DRF's stdlib json path otherwise).
+
+
+def load_json_backend(name):
+    """Return the orjson module for the configured backend, or None for stdlib."""
+    if name == 'stdlib':
+        return None
+    if name not in ('auto', 'orjson'):
+        raise ImproperlyConfigured(f'Unknown JSON_BACKEND {name!r}')
+    try:
+        import orjson
+    except ImportError:
+        if name == 'orjson':
+            raise ImproperlyConfigured('JSON_BACKEND is "orjson" but orjson is not installed')
+        return None
+    return orjson
+
+
+orjson = load_json_backend(getattr(settings, 'JSON_BACKEND', 'auto'))
+
+_fallback_encoder = JSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson (UUIDs and datetimes natively) when available."""
+
+    backend = orjson
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if self.backend is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            # Pretty printing is for humans; keep DRF's formatting.
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = self.backend.dumps(
+            data, default=_fallback_encoder.default, option=self.backend.OPT_NON_STR_KEYS
+        )
+        # Same JavaScript-subset escaping as DRF's renderer.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser that decodes with orjson when available."""
+
+    renderer_class = FastJSONRenderer
+    backend = orjson
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if self.backend is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return self.backend.loads(stream.read())
+        except self.backend.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,119 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+# ============================================================
+# READ REPLICA ROUTING
+# ============================================================
+# Views using ReplicaReadMixin read from one of settings.DATABASE_REPLICAS;
+# everything else, and every write, uses the primary ("default"). Within a
+# request the first write pins the rest of it to the primary, and for
+# settings.REPLICA_STICKY_SECONDS after a successful unsafe request the same
+# client (user, or IP when anonymous) keeps reading from the primary so it
+# sees its own writes despite replica lag. The window is tracked in the
+# default cache, so use a shared cache when running several processes.
+
+
+class RoutingState:
+    __slots__ = ('use_replica', 'pinned', 'alias')
+
+    def __init__(self):
+        self.use_replica = False
+        self.pinned = False
+        self.alias = None
+
+
+_state = ContextVar('core_db_routing', default=None)
+
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', ())
+
+
+@contextmanager
+def routing():
+    """Fresh routing state for one request."""
+    state = RoutingState()
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def read_alias():
+    """The alias reads are sent to right now, or None for the primary."""
+    state = _state.get()
+    aliases = replica_aliases()
+    if state is None or not state.use_replica or state.pinned or not aliases:
+        return None
+    if state.alias is None:
+        # One replica per request so every query sees the same snapshot.
+        state.alias = random.choice(aliases)
+    return state.alias
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.pinned = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold copies of the same rows.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas are copies of the primary and are never migrated directly.
+        return db not in replica_aliases()
+
+
+def sticky_key(request):
+    user = getattr(request, 'user', None)
+    ident = user.pk if user is not None and user.is_authenticated else request.META.get('REMOTE_ADDR')
+    return f'replica-sticky:{ident}'
+
+
+def recently_wrote(request):
+    return bool(getattr(settings, 'REPLICA_STICKY_SECONDS', 0)) and cache.get(sticky_key(request)) is not None
+
+
+def remember_write(request):
+    window = getattr(settings, 'REPLICA_STICKY_SECONDS', 0)
+    if window:
+        cache.set(sticky_key(request), 1, timeout=window)
+
+
+class ReplicaRoutingMiddleware:
+    """Scope routing state to the request and start the stickiness window after writes."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with routing():
+            response = self.get_response(request)
+        # DRF copies the authenticated user onto the Django request.
+        if request.method not in SAFE_METHODS and response.status_code < 400 and replica_aliases():
+            remember_write(request)
+        return response
+
+
+class ReplicaReadMixin:
+    """For read-only DRF views: send safe requests to a replica unless the client just wrote."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        state = _state.get()
+        if state is None or not replica_aliases():
+            return
+        if request.method in SAFE_METHODS and not recently_wrote(request):
+            state.use_replica = True
@@ -0,0 +1,89 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .models import Application, ArchivedApplication, ArchivedJob, Job, Resume
+
+# ============================================================
+# RETENTION / ARCHIVAL
+# ============================================================
+# Jobs older than settings.JOB_RETENTION_DAYS are expired. Archiving copies
+# them and their applications into the Archived* tables and deletes the live
+# rows. Every step is its own short transaction so the SQLite write lock is
+# only ever held for one small batch; a crash mid-way is safe to re-run.
+
+JOB_FIELDS = ['id', 'employer_id', 'title', 'description', 'location', 'duration', 'skills', 'approved', 'created_at']
+
+
+def retention_cutoff(days=None, now=None):
+    days = settings.JOB_RETENTION_DAYS if days is None else days
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def expired_jobs(cutoff):
+    return Job.objects.filter(created_at__lt=cutoff)
+
+
+def archive_job_batch(job_ids):
+    """Copy one batch of jobs into the archive (idempotent)."""
+    with transaction.atomic():
+        rows = Job.objects.filter(id__in=job_ids).values(*JOB_FIELDS)
+        ArchivedJob.objects.bulk_create([ArchivedJob(**row) for row in rows], ignore_conflicts=True)
+
+
+def archive_application_batch(job_ids, batch_size):
+    """Move up to batch_size applications of these jobs; returns how many moved."""
+    latest_resume = Resume.objects.filter(student=OuterRef('student')).order_by('-uploaded_at').values('file')[:1]
+    with transaction.atomic():
+        rows = list(
+            Application.objects.filter(job_id__in=job_ids)
+            .annotate(resume_file=Subquery(latest_resume))
+            .values('id', 'job_id', 'student_id', 'status', 'match_score', 'created_at', 'resume_file')[:batch_size]
+        )
+        if not rows:
+            return 0
+        for row in rows:
+            row['resume_file'] = row['resume_file'] or ''
+        ArchivedApplication.objects.bulk_create([ArchivedApplication(**row) for row in rows], ignore_conflicts=True)
+        Application.objects.filter(id__in=[row['id'] for row in rows]).delete()
+    return len(rows)
+
+
+def delete_archived_jobs(job_ids):
+    with transaction.atomic():
+        Job.objects.filter(id__in=job_ids, application__isnull=True).delete()
+
+
+def archive_expired(cutoff, batch_size=200, pause=0.0, on_batch=None):
+    """
+    Archive every job created before `cutoff`, `batch_size` rows per transaction.
+
+    `pause` sleeps between transactions to give other writers the lock;
+    `on_batch(jobs, applications)` is called after each job batch.
+    Returns (jobs archived, applications archived).
+    """
+    total_jobs = total_apps = 0
+    while True:
+        job_ids = list(expired_jobs(cutoff).order_by('created_at').values_list('id', flat=True)[:batch_size])
+        if not job_ids:
+            return total_jobs, total_apps
+
+        archive_job_batch(job_ids)
+        apps = 0
+        while True:
+            moved = archive_application_batch(job_ids, batch_size)
+            apps += moved
+            if moved < batch_size:
+                break
+            time.sleep(pause)
+        delete_archived_jobs(job_ids)
+
+        total_jobs += len(job_ids)
+        total_apps += apps
+        if on_batch:
+            on_batch(len(job_ids), apps)
+        time.sleep(pause)
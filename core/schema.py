@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+import drf_spectacular
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from drf_spectacular.renderers import OpenApiJsonRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+# ============================================================
+# PRECOMPUTED OPENAPI SCHEMA
+# ============================================================
+# The schema only changes when the code does, so it is generated once per
+# code version (by `manage.py build_openapi_schema` or on the first request),
+# written to settings.SCHEMA_CACHE_PATH and served from memory afterwards.
+
+SCHEMA_SOURCE_PACKAGES = ('core', 'zou_jobfinder')
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    """settings.SCHEMA_CODE_VERSION, or a hash of the project sources and schema settings."""
+    configured = getattr(settings, 'SCHEMA_CODE_VERSION', None)
+    if configured:
+        return configured
+
+    digest = hashlib.sha256()
+    digest.update(drf_spectacular.__version__.encode())
+    digest.update(repr(sorted(getattr(settings, 'SPECTACULAR_SETTINGS', {}).items())).encode())
+    base_dir = Path(settings.BASE_DIR)
+    for package in SCHEMA_SOURCE_PACKAGES:
+        for path in sorted((base_dir / package).rglob('*.py')):
+            if 'migrations' in path.parts:
+                continue
+            digest.update(str(path.relative_to(base_dir)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def generate_schema():
+    """Introspect every view and return the schema as plain JSON-compatible data."""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    # Round trip through JSON to drop lazy strings and other non-plain values.
+    return json.loads(OpenApiJsonRenderer().render(schema, renderer_context={}))
+
+
+def make_etag(body):
+    return '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+
+
+class SchemaCache:
+    """In-process copy of the schema plus its rendered bodies and ETags per media type."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self._version = None
+        self._schema = None
+        self._rendered = {}
+
+    @property
+    def path(self):
+        return Path(getattr(settings, 'SCHEMA_CACHE_PATH', Path(settings.BASE_DIR) / 'openapi-schema.json'))
+
+    def get_schema(self):
+        version = code_version()
+        if self._version != version:
+            with self._lock:
+                if self._version != version:
+                    schema = self.load(version)
+                    if schema is None:
+                        schema = generate_schema()
+                        self.store(version, schema)
+                    self._schema, self._rendered, self._version = schema, {}, version
+        return self._schema
+
+    def rebuild(self):
+        """Regenerate and store the schema for the current code version."""
+        with self._lock:
+            version = code_version()
+            schema = generate_schema()
+            self.store(version, schema)
+            self._schema, self._rendered, self._version = schema, {}, version
+        return schema
+
+    def render(self, renderer):
+        """Return (body, etag) for the renderer's media type, rendering at most once."""
+        schema = self.get_schema()
+        rendered = self._rendered.get(renderer.media_type)
+        if rendered is None:
+            body = renderer.render(schema, renderer_context={})
+            rendered = self._rendered[renderer.media_type] = (body, make_etag(body))
+        return rendered
+
+    def load(self, version):
+        try:
+            with open(self.path, 'rb') as fh:
+                artifact = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if artifact.get('version') != version:
+            return None
+        return artifact.get('schema')
+
+    def store(self, version, schema):
+        path = self.path
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        try:
+            with open(tmp, 'w') as fh:
+                json.dump({'version': version, 'schema': schema}, fh)
+            os.replace(tmp, path)
+        except OSError:
+            # A read-only disk only costs us the on-disk copy.
+            tmp.unlink(missing_ok=True)
+
+
+schema_cache = SchemaCache()
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """SpectacularAPIView that serves the precomputed schema with an ETag"""
+
+    def uses_default_schema(self, request):
+        return not (
+            request.GET.get('lang') or request.GET.get('version') or request.version
+            or self.api_version or self.urlconf or self.custom_settings or self.patterns
+            or not self.serve_public
+        )
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        if not self.uses_default_schema(request):
+            return super().get(request, *args, **kwargs)
+
+        renderer = request.accepted_renderer
+        body, etag = schema_cache.render(renderer)
+        client_etags = {tag.removeprefix('W/') for tag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))}
+        if etag in client_etags or '*' in client_etags:
+            response = HttpResponseNotModified()
+        else:
+            content_type = request.accepted_media_type
+            if renderer.charset:
+                content_type = f'{content_type}; charset={renderer.charset}'
+            response = HttpResponse(body, content_type=content_type)
+            response['Content-Disposition'] = f'inline; filename="{self._get_filename(request, None)}"'
+        response['ETag'] = etag
+        response['Cache-Control'] = 'no-cache'
+        return response
@@ -0,0 +1,212 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Application, RescoreQueue, Resume
+
+# ============================================================
+# MATCH SCORES
+# ============================================================
+# An application's match_score is the share of the job's listed skills that
+# appear in the student's latest resume skills (0-100, 50 when the job lists
+# none). Skills are mapped to bits so a whole batch is scored with integer
+# AND and bit_count instead of per-pair set work.
+#
+# Editing a job's skills or uploading a resume queues the affected
+# (job, student) pairs in RescoreQueue. Up to settings.RESCORE_INLINE_LIMIT
+# of the pairs a change queued are rescored right after it commits; the rest,
+# and anything else in the queue, waits for `manage.py rescore_applications`.
+
+NEUTRAL_SCORE = 50
+SCORE_BATCH_SIZE = 1000
+QUEUE_CHUNK_SIZE = 2000
+PAIR_CHUNK_SIZE = 100
+
+
+def parse_skills(text):
+    return {skill.strip().lower() for skill in text.split(',') if skill.strip()}
+
+
+class SkillBits:
+    """Assigns every skill seen a bit and turns skill lists into integer masks."""
+
+    def __init__(self):
+        self.bits = {}
+        self.masks = {}
+
+    def mask(self, text):
+        mask = self.masks.get(text)
+        if mask is None:
+            mask = 0
+            for skill in parse_skills(text):
+                mask |= 1 << self.bits.setdefault(skill, len(self.bits))
+            self.masks[text] = mask
+        return mask
+
+
+def score_masks(job_masks, resume_masks):
+    """Score aligned lists of job and resume masks."""
+    return [
+        round(100 * (job & resume).bit_count() / job.bit_count()) if job else NEUTRAL_SCORE
+        for job, resume in zip(job_masks, resume_masks)
+    ]
+
+
+def match_score(job_skills, resume_skills):
+    bits = SkillBits()
+    return score_masks([bits.mask(job_skills)], [bits.mask(resume_skills)])[0]
+
+
+def latest_resume_skills(student_ids):
+    """Map each student to the skills of their most recent resume ('' when none)."""
+    skills = {}
+    rows = Resume.objects.filter(student_id__in=student_ids).order_by('student_id', '-uploaded_at')
+    for student_id, text in rows.values_list('student_id', 'skills'):
+        skills.setdefault(student_id, text)
+    return skills
+
+
+def score_batch(applications):
+    """Recompute a batch of applications (with job loaded); returns those whose score changed."""
+    skills = latest_resume_skills({app.student_id for app in applications})
+    bits = SkillBits()
+    scores = score_masks(
+        [bits.mask(app.job.skills) for app in applications],
+        [bits.mask(skills.get(app.student_id, '')) for app in applications],
+    )
+    changed = []
+    for app, score in zip(applications, scores):
+        if app.match_score != score:
+            app.match_score = score
+            changed.append(app)
+    return changed
+
+
+def bulk_update_scores(applications, chunk_size=SCORE_BATCH_SIZE):
+    """
+    Write match scores back with one UPDATE per distinct score and chunk.
+
+    Scores only take 101 values, so grouping by score needs a handful of
+    `UPDATE ... WHERE id IN (...)` statements per batch, where
+    QuerySet.bulk_update would build a CASE expression with a branch per row.
+    """
+    by_score = {}
+    for app in applications:
+        by_score.setdefault(app.match_score, []).append(app.pk)
+    for score, ids in by_score.items():
+        for start in range(0, len(ids), chunk_size):
+            Application.objects.filter(pk__in=ids[start:start + chunk_size]).update(match_score=score)
+
+
+def scoring_queryset():
+    return Application.objects.select_related('job').only('id', 'match_score', 'student_id', 'job__id', 'job__skills')
+
+
+def rescore_all(batch_size=SCORE_BATCH_SIZE, on_batch=None):
+    """
+    Rescore every application, walking the primary key in batches.
+
+    `on_batch(scanned, updated)` is called after each batch with running
+    totals. Returns (applications scanned, applications updated).
+    """
+    scanned = updated = 0
+    last = None
+    while True:
+        queryset = scoring_queryset().order_by('pk')
+        if last is not None:
+            queryset = queryset.filter(pk__gt=last)
+        applications = list(queryset[:batch_size])
+        if not applications:
+            return scanned, updated
+        last = applications[-1].pk
+        changed = score_batch(applications)
+        with transaction.atomic():
+            bulk_update_scores(changed)
+        scanned += len(applications)
+        updated += len(changed)
+        if on_batch:
+            on_batch(scanned, updated)
+
+
+def enqueue(pairs):
+    """
+    Queue (job_id, student_id) pairs for rescoring; duplicates are dropped.
+
+    Up to settings.RESCORE_INLINE_LIMIT of these pairs are rescored once the
+    change commits. Other queued work is never drained here, so one request
+    only pays for its own change.
+    """
+    limit = getattr(settings, 'RESCORE_INLINE_LIMIT', 100)
+    inline = []
+    batch = []
+    for pair in pairs:
+        if len(inline) < limit:
+            inline.append(pair)
+        batch.append(RescoreQueue(job_id=pair[0], student_id=pair[1]))
+        if len(batch) >= QUEUE_CHUNK_SIZE:
+            RescoreQueue.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    RescoreQueue.objects.bulk_create(batch, ignore_conflicts=True)
+    if inline:
+        transaction.on_commit(lambda: rescore_pairs(inline))
+
+
+def rescore_pairs(pairs, chunk_size=PAIR_CHUNK_SIZE):
+    """Rescore these queued pairs now and take them off the queue; returns applications updated."""
+    updated = 0
+    for start in range(0, len(pairs), chunk_size):
+        chunk = set(pairs[start:start + chunk_size])
+        matching = Q()
+        for job_id, student_id in chunk:
+            matching |= Q(job_id=job_id, student_id=student_id)
+        with transaction.atomic():
+            # Dequeued before scoring, as in drain(), so a change queued meanwhile is not lost.
+            RescoreQueue.objects.filter(matching).delete()
+            applications = list(scoring_queryset().filter(matching))
+            changed = score_batch(applications)
+            bulk_update_scores(changed)
+        updated += len(changed)
+    return updated
+
+
+def enqueue_job(job):
+    """A job's skills changed: queue every application to it."""
+    students = Application.objects.filter(job=job).values_list('student_id', flat=True)
+    enqueue((job.pk, student_id) for student_id in students.iterator(chunk_size=QUEUE_CHUNK_SIZE))
+
+
+def enqueue_student(student):
+    """A student's resume changed: queue every application they made."""
+    jobs = Application.objects.filter(student=student).values_list('job_id', flat=True)
+    enqueue((job_id, student.pk) for job_id in jobs.iterator(chunk_size=QUEUE_CHUNK_SIZE))
+
+
+def drain(limit=None, batch_size=SCORE_BATCH_SIZE, on_batch=None):
+    """
+    Rescore queued pairs, oldest first, until the queue is empty or `limit` pairs are done.
+
+    Queue rows are deleted in the same transaction that reads them, before
+    scoring, so a change queued meanwhile is never lost. Returns
+    (pairs processed, applications updated).
+    """
+    processed = updated = 0
+    while limit is None or processed < limit:
+        size = batch_size if limit is None else min(batch_size, limit - processed)
+        with transaction.atomic():
+            queued = list(RescoreQueue.objects.order_by('id').values_list('id', 'job_id', 'student_id')[:size])
+            if not queued:
+                break
+            RescoreQueue.objects.filter(id__in=[row[0] for row in queued]).delete()
+            pairs = {(job_id, student_id) for _, job_id, student_id in queued}
+            candidates = scoring_queryset().filter(
+                job_id__in={job_id for job_id, _ in pairs},
+                student_id__in={student_id for _, student_id in pairs},
+            )
+            applications = [app for app in candidates if (app.job_id, app.student_id) in pairs]
+            changed = score_batch(applications)
+            bulk_update_scores(changed)
+        processed += len(queued)
+        updated += len(changed)
+        if on_batch:
+            on_batch(processed, updated)
+    return processed, updated
@@ -0,0 +1,215 @@
+import html
+import io
+import mimetypes
+import re
+import uuid
+import zlib
+
+from django.db import connection, transaction
+
+from .models import Application, Job, Resume, User
+
+# ============================================================
+# TALENT SEARCH (SQLite FTS5)
+# ============================================================
+# Each student has one row in core_resume_fts holding the text and skills of
+# their latest resume. The row id is derived from the student's UUID, so a
+# new upload replaces the old row with two indexed statements.
+
+FTS_TABLE = 'core_resume_fts'
+
+SKILL_VOCABULARY = (
+    'Python', 'Django', 'Flask', 'FastAPI', 'JavaScript', 'TypeScript', 'React', 'Angular', 'Vue',
+    'Node.js', 'Java', 'Kotlin', 'Swift', 'C#', 'C++', 'Go', 'Rust', 'PHP', 'Laravel', 'Ruby',
+    'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP',
+    'Linux', 'Git', 'Excel', 'Power BI', 'Tableau', 'Machine Learning', 'Data Analysis', 'Statistics',
+    'Accounting', 'Marketing', 'Sales', 'Customer Service', 'Project Management', 'Communication',
+    'Teamwork', 'Leadership', 'Problem-Solving', 'Graphic Design', 'Photoshop', 'Figma',
+    'Supply Chain', 'Logistics', 'Human Resources', 'Networking', 'IT Support',
+)
+
+_SKILL_PATTERN = re.compile(
+    r'(?<![\w+#.])(' + '|'.join(re.escape(skill) for skill in SKILL_VOCABULARY) + r')(?![\w+#])',
+    re.IGNORECASE,
+)
+_CANONICAL_SKILLS = {skill.lower(): skill for skill in SKILL_VOCABULARY}
+_QUERY_TOKEN = re.compile(r'\w+')
+# Uploads indexed as text besides PDFs (by file name)
+TEXT_TYPES = {'text/plain', 'text/markdown'}
+# snippet() wraps matches in these private-use characters; the resume text
+# around them is HTML-escaped before they become <mark> tags.
+MARK_START, MARK_END = '\ue000', '\ue001'
+
+
+class SearchUnavailable(Exception):
+    """Raised when the database has no FTS5 index (non-SQLite backends)."""
+
+
+def search_supported():
+    return connection.vendor == 'sqlite'
+
+
+def extract_pdf_text(data):
+    try:
+        from pypdf import PdfReader
+        from pypdf.errors import PyPdfError
+    except ImportError:
+        return ''
+    try:
+        return '\n'.join(page.extract_text() or '' for page in PdfReader(io.BytesIO(data)).pages)
+    except (PyPdfError, ValueError, KeyError, TypeError, AttributeError, IndexError, zlib.error):
+        # Truncated or corrupt PDF: keep the upload, index it as empty.
+        return ''
+
+
+def extract_text(file):
+    """
+    Plain text of an uploaded resume, or '' when there is none to index.
+
+    Only PDFs (which need the optional pypdf package) and UTF-8 text files
+    are read; anything else, such as Word documents or images, would only
+    put binary noise into the index.
+    """
+    file.open('rb')
+    try:
+        data = file.read()
+    finally:
+        file.close()
+    if data.startswith(b'%PDF'):
+        return extract_pdf_text(data)
+    if mimetypes.guess_type(file.name)[0] not in TEXT_TYPES or b'\0' in data:
+        return ''
+    try:
+        return data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return ''
+
+
+def extract_skills(text):
+    """Comma separated vocabulary skills mentioned in the text, in first-seen order."""
+    found = dict.fromkeys(_CANONICAL_SKILLS[match.lower()] for match in _SKILL_PATTERN.findall(text))
+    return ', '.join(found)[:255]
+
+
+def fts_rowid(student_id):
+    """Stable positive 63-bit row id for a student."""
+    return student_id.int >> 65
+
+
+def index_resume(resume):
+    """Replace the student's row in the full-text index with this resume."""
+    if not search_supported():
+        return
+    with transaction.atomic(), connection.cursor() as cursor:
+        rowid = fts_rowid(resume.student_id)
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [rowid])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, student_id, resume_id, text, skills) VALUES (%s, %s, %s, %s, %s)',
+            [rowid, resume.student_id.hex, resume.id.hex, resume.text, resume.skills],
+        )
+
+
+def process_resume(resume, extract=True):
+    """Extract text and skills from the stored file (unless already done) and index the resume."""
+    if extract:
+        resume.text = extract_text(resume.file)
+        resume.skills = extract_skills(resume.text)
+        resume.save(update_fields=['text', 'skills'])
+    index_resume(resume)
+    return resume
+
+
+def rename_indexed_resume(student_id, old_id, new_id):
+    """Point the student's index row at a resume's new primary key."""
+    if search_supported():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {FTS_TABLE} SET resume_id = %s WHERE rowid = %s AND resume_id = %s',
+                [new_id.hex, fts_rowid(student_id), old_id.hex],
+            )
+
+
+def clear_index():
+    if search_supported():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+
+
+def build_match(query):
+    """Quote every word so user input is never parsed as FTS5 syntax; any word may match, bm25 ranks."""
+    tokens = _QUERY_TOKEN.findall(query)
+    return ' OR '.join(f'"{token}"' for token in tokens) or None
+
+
+def highlight(snippet):
+    """HTML for a snippet: the resume text escaped, only the matches marked up."""
+    return html.escape(snippet or '').replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def search_talent(employer, query, limit=20):
+    """
+    Rank the students who applied to this employer's jobs by resume relevance.
+
+    Returns dicts with the student, their indexed resume id, skills, bm25 score
+    (lower is better) and a highlighted snippet, safe to render as HTML.
+    """
+    if not search_supported():
+        raise SearchUnavailable('Talent search needs SQLite FTS5')
+    match = build_match(query)
+    if match is None:
+        return []
+
+    with connection.cursor() as cursor:
+        # A correlated EXISTS probes the application/job indexes once per
+        # match; `student_id IN (applicants)` would first materialise every
+        # applicant of the employer. Snippets are built in a second pass so
+        # only the returned rows pay for them.
+        cursor.execute(
+            f"""
+            SELECT rowid, bm25({FTS_TABLE}, 0.0, 0.0, 1.0, 3.0) AS score
+            FROM {FTS_TABLE}
+            WHERE {FTS_TABLE} MATCH %s AND EXISTS (
+                SELECT 1 FROM {Application._meta.db_table} a
+                INNER JOIN {Job._meta.db_table} j ON a.job_id = j.id
+                WHERE a.student_id = {FTS_TABLE}.student_id AND j.employer_id = %s
+            )
+            ORDER BY score
+            LIMIT %s
+            """,
+            [match, employer.pk.hex, limit],
+        )
+        ranked = cursor.fetchall()
+        if not ranked:
+            return []
+        scores = dict(ranked)
+        cursor.execute(
+            f"""
+            SELECT rowid, student_id, resume_id, skills,
+                   snippet({FTS_TABLE}, 2, %s, %s, '…', 16)
+            FROM {FTS_TABLE}
+            WHERE {FTS_TABLE} MATCH %s AND rowid IN ({', '.join(['%s'] * len(scores))})
+            """,
+            [MARK_START, MARK_END, match, *scores],
+        )
+        rows = sorted(cursor.fetchall(), key=lambda row: scores[row[0]])
+
+    students = User.objects.only('id', 'username', 'email', 'role').in_bulk([uuid.UUID(row[1]) for row in rows])
+    return [
+        {
+            'student': students[uuid.UUID(student_id)],
+            'resume_id': uuid.UUID(resume_id),
+            'skills': skills,
+            'score': scores[rowid],
+            'snippet': highlight(snippet),
+        }
+        for rowid, student_id, resume_id, skills, snippet in rows
+    ]
+
+
+def latest_resumes():
+    """Each student's most recent resume, streamed."""
+    seen = None
+    for resume in Resume.objects.order_by('student_id', '-uploaded_at').iterator(chunk_size=1000):
+        if resume.student_id != seen:
+            seen = resume.student_id
+            yield resume
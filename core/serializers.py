@@ -1,11 +1,88 @@
 from rest_framework import serializers
-from .models import User, Job, Application, Resume
+from .models import User, Job, Application, Resume, ArchivedJob, ArchivedApplication
+
+# ============================================================
+# SPARSE FIELDSETS
+# ============================================================
+
+class SparseFieldsMixin:
+    """
+    Let callers trim a serializer with `fields` and collapse nested objects with `expand`.
+
+    `fields` is a set of top-level field names. `expand` is a set of dotted paths
+    ("job", "job.employer"); nested serializers not listed are rendered as their
+    primary key. None for either means "everything", which is the default.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sparse_fields = fields
+        self._sparse_expand = expand
+
+    @classmethod
+    def expandable_fields(cls):
+        return {
+            name: type(field)
+            for name, field in cls._declared_fields.items()
+            if isinstance(field, SparseFieldsMixin)
+        }
+
+    @staticmethod
+    def nested_expand(expand, name):
+        if expand is None:
+            return None
+        prefix = name + '.'
+        return {path[len(prefix):] for path in expand if path.startswith(prefix)}
+
+    @staticmethod
+    def is_expanded(expand, name):
+        return expand is None or any(path == name or path.startswith(name + '.') for path in expand)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self._sparse_fields is not None:
+            fields = {name: field for name, field in fields.items() if name in self._sparse_fields}
+        for name, field in list(fields.items()):
+            if not isinstance(field, SparseFieldsMixin):
+                continue
+            if self.is_expanded(self._sparse_expand, name):
+                field._sparse_expand = self.nested_expand(self._sparse_expand, name)
+            else:
+                fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+        return fields
+
+    @classmethod
+    def sparse_columns(cls, fields=None, expand=None, prefix=''):
+        """Return (only() paths, select_related() paths) needed to render this variant."""
+        nested = cls.expandable_fields()
+        only, related = [prefix + 'id'], []
+        for name in cls.Meta.fields:
+            if fields is not None and name not in fields:
+                continue
+            only.append(prefix + name)
+            if name in nested and cls.is_expanded(expand, name):
+                related.append(prefix + name)
+                nested_only, nested_related = nested[name].sparse_columns(
+                    expand=cls.nested_expand(expand, name), prefix=f'{prefix}{name}__'
+                )
+                only += nested_only
+                related += nested_related
+        return only, related
+
+    @classmethod
+    def sparse_queryset(cls, queryset, fields=None, expand=None):
+        """Restrict the SELECT list and joins to what this variant renders."""
+        only, related = cls.sparse_columns(fields, expand)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*only)
+
 
 # ============================================================
 # USER SERIALIZER
 # ============================================================
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serialize basic user info."""
     
     class Meta:
@@ -18,7 +95,7 @@ class UserSerializer(serializers.ModelSerializer):
 # JOB SERIALIZERS
 # ============================================================
 
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serialize job details with nested employer info."""
     
     employer = UserSerializer(read_only=True)
@@ -58,7 +135,7 @@ class JobCreateSerializer(serializers.ModelSerializer):
 # APPLICATION SERIALIZER
 # ============================================================
 
-class ApplicationSerializer(serializers.ModelSerializer):
+class ApplicationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serialize application with nested student and job info."""
     
     job = JobSerializer(read_only=True)
@@ -81,7 +158,7 @@ class ApplicationSerializer(serializers.ModelSerializer):
 # RESUME SERIALIZER
 # ============================================================
 
-class ResumeSerializer(serializers.ModelSerializer):
+class ResumeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serialize resume with nested student info and autogenerated fields."""
     
     student = UserSerializer(read_only=True)
@@ -94,6 +171,110 @@ class ResumeSerializer(serializers.ModelSerializer):
             'file',
             'resume_score',
             'feedback',
+            'skills',
             'uploaded_at',
         ]
-        read_only_fields = ['id', 'student', 'resume_score', 'feedback', 'uploaded_at']
+        read_only_fields = ['id', 'student', 'resume_score', 'feedback', 'skills', 'uploaded_at']
+
+
+# ============================================================
+# TALENT SEARCH SERIALIZER
+# ============================================================
+
+class TalentSearchResultSerializer(serializers.Serializer):
+    """One ranked student from an employer's talent search."""
+
+    student = UserSerializer(read_only=True)
+    resume_id = serializers.UUIDField(read_only=True)
+    skills = serializers.CharField(read_only=True)
+    score = serializers.FloatField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+
+
+class DuplicateJobSerializer(serializers.Serializer):
+    """A posting that looks like a near-duplicate of another job."""
+
+    id = serializers.UUIDField(read_only=True)
+    title = serializers.CharField(read_only=True)
+    employer = serializers.UUIDField(read_only=True)
+    similarity = serializers.FloatField(read_only=True)
+
+
+class SuggestionSerializer(serializers.Serializer):
+    """One autocomplete suggestion and how many approved jobs use it."""
+
+    value = serializers.CharField(read_only=True)
+    count = serializers.IntegerField(read_only=True)
+
+
+class AutocompleteSerializer(serializers.Serializer):
+    """Suggestions per field; only the requested fields are present."""
+
+    title = SuggestionSerializer(many=True, read_only=True, required=False)
+    skills = SuggestionSerializer(many=True, read_only=True, required=False)
+    location = SuggestionSerializer(many=True, read_only=True, required=False)
+
+
+class StatsBucketSerializer(serializers.Serializer):
+    """Event counts for one time bucket, optionally for one location or employer."""
+
+    bucket = serializers.DateField(read_only=True)
+    location = serializers.CharField(read_only=True, required=False)
+    employer = serializers.CharField(read_only=True, required=False)
+    jobs_posted = serializers.IntegerField(read_only=True)
+    jobs_approved = serializers.IntegerField(read_only=True)
+    applications = serializers.IntegerField(read_only=True)
+
+
+class StatsSerializer(serializers.Serializer):
+    """Platform statistics over a date range, read from the daily rollups."""
+
+    start = serializers.DateField(read_only=True)
+    end = serializers.DateField(read_only=True)
+    interval = serializers.CharField(read_only=True)
+    group_by = serializers.CharField(read_only=True, allow_null=True)
+    buckets = StatsBucketSerializer(many=True, read_only=True)
+
+
+# ============================================================
+# ARCHIVE SERIALIZERS
+# ============================================================
+
+class ArchivedJobSerializer(serializers.ModelSerializer):
+    """Read-only view of an archived job."""
+
+    class Meta:
+        model = ArchivedJob
+        fields = [
+            'id',
+            'title',
+            'description',
+            'location',
+            'duration',
+            'skills',
+            'approved',
+            'created_at',
+            'archived_at',
+        ]
+        read_only_fields = fields
+
+
+class ArchivedApplicationSerializer(serializers.ModelSerializer):
+    """Read-only view of an archived application with its archived job."""
+
+    job = ArchivedJobSerializer(read_only=True)
+    student = UserSerializer(read_only=True)
+
+    class Meta:
+        model = ArchivedApplication
+        fields = [
+            'id',
+            'job',
+            'student',
+            'status',
+            'match_score',
+            'resume_file',
+            'created_at',
+            'archived_at',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,278 @@
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import Application, ArchivedApplication, ArchivedJob, Job, StatRollup
+
+# ============================================================
+# ANALYTICS ROLLUPS
+# ============================================================
+# Daily counters for platform reporting, kept in StatRollup so a range
+# query reads one row per bucket instead of aggregating Job/Application.
+# Every event bumps three rows: the platform total, its location and its
+# employer. Days are the job's / application's creation date, so
+# jobs_approved counts the jobs posted that day that are approved (rejecting
+# one again takes it back off). Moving a job to another location moves its
+# counts with it and deleting one takes them off, so the counters always
+# describe the jobs and applications that exist. The write paths update the
+# counters in their own transaction; `manage.py backfill_stats` rebuilds
+# them from the live and archived tables, e.g. after bulk changes made
+# outside the app.
+
+METRICS = ('jobs_posted', 'jobs_approved', 'applications')
+DIMENSIONS = ('location', 'employer')
+INTERVALS = ('day', 'week', 'month')
+BACKFILL_BATCH_SIZE = 2000
+
+
+def bucket_day(moment):
+    return timezone.localdate(moment) if timezone.is_aware(moment) else moment.date()
+
+
+def day_start(day):
+    start = datetime.combine(day, time.min)
+    return timezone.make_aware(start) if settings.USE_TZ else start
+
+
+def count_event(counts, metric, moment, employer_id, location, delta=1):
+    count_day(counts, metric, bucket_day(moment), employer_id, location, delta)
+
+
+def count_day(counts, metric, day, employer_id, location, delta=1):
+    counts[(metric, '', '', day)] += delta
+    counts[(metric, 'location', location, day)] += delta
+    counts[(metric, 'employer', str(employer_id), day)] += delta
+
+
+def add(counts):
+    """Apply a Counter of (metric, dimension, value, day) deltas to the rollups."""
+    # Sorted so concurrent writers lock rows in the same order.
+    for (metric, dimension, value, day), delta in sorted(counts.items()):
+        if not delta:
+            continue
+        row = StatRollup.objects.filter(metric=metric, dimension=dimension, value=value, day=day)
+        if row.update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                StatRollup.objects.create(metric=metric, dimension=dimension, value=value, day=day, count=delta)
+        except IntegrityError:
+            # Another request created the row first.
+            row.update(count=F('count') + delta)
+
+
+# ------------------------------------------------------------
+# Write paths
+# ------------------------------------------------------------
+
+def record_jobs_posted(jobs):
+    counts = Counter()
+    for job in jobs:
+        count_event(counts, 'jobs_posted', job.created_at, job.employer_id, job.location)
+        if job.approved:
+            count_event(counts, 'jobs_approved', job.created_at, job.employer_id, job.location)
+    add(counts)
+
+
+def record_approvals(jobs, delta=1):
+    """Jobs were approved (delta=1) or had their approval withdrawn (delta=-1)."""
+    counts = Counter()
+    for job in jobs:
+        count_event(counts, 'jobs_approved', job.created_at, job.employer_id, job.location, delta)
+    add(counts)
+
+
+def record_approval_changes(jobs, delta=1):
+    """
+    Every job in the `jobs` queryset is about to be approved (delta=1) or
+    have its approval withdrawn (delta=-1). Counted with one aggregate query
+    per day, location and employer, however many jobs there are.
+    """
+    counts = Counter()
+    groups = jobs.order_by().values('created_at__date', 'location', 'employer_id').annotate(jobs=Count('pk'))
+    for group in groups.iterator():
+        count_day(counts, 'jobs_approved', group['created_at__date'], group['employer_id'], group['location'], delta * group['jobs'])
+    add(counts)
+
+
+def count_job(counts, job, location, delta):
+    """Count every event of a live job (posting, approval, applications) at `location`."""
+    count_event(counts, 'jobs_posted', job.created_at, job.employer_id, location, delta)
+    if job.approved:
+        count_event(counts, 'jobs_approved', job.created_at, job.employer_id, location, delta)
+    applications = Application.objects.filter(job=job).values_list('created_at', flat=True)
+    for created_at in applications.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        count_event(counts, 'applications', created_at, job.employer_id, location, delta)
+
+
+def record_job_moved(job, old_location):
+    """A job's location changed: move its counts from the old location to the new one."""
+    if job.location == old_location:
+        return
+    counts = Counter()
+    count_job(counts, job, old_location, -1)
+    count_job(counts, job, job.location, 1)
+    add(counts)
+
+
+def record_job_deleted(job):
+    """Call before deleting a job: takes it and its applications off the counters."""
+    counts = Counter()
+    count_job(counts, job, job.location, -1)
+    add(counts)
+
+
+def record_job_changed(old, job):
+    """A job was edited; `old` is how it was. Moves or flips its counts as needed."""
+    if (old.location, old.employer_id) != (job.location, job.employer_id):
+        counts = Counter()
+        count_job(counts, old, old.location, -1)
+        count_job(counts, job, job.location, 1)
+        add(counts)
+    elif old.approved != job.approved:
+        record_approvals([job], 1 if job.approved else -1)
+
+
+def record_jobs_deleted(jobs):
+    """
+    Call before deleting the `jobs` queryset: takes them and their
+    applications off the counters with one aggregate query each.
+    """
+    counts = Counter()
+    groups = jobs.order_by().values('created_at__date', 'location', 'employer_id', 'approved').annotate(jobs=Count('pk'))
+    for group in groups.iterator():
+        metrics = ('jobs_posted', 'jobs_approved') if group['approved'] else ('jobs_posted',)
+        for metric in metrics:
+            count_day(counts, metric, group['created_at__date'], group['employer_id'], group['location'], -group['jobs'])
+    add(counts)
+    record_applications_deleted(Application.objects.filter(job__in=jobs.values('pk')))
+
+
+def record_application(application, delta=1):
+    job = application.job
+    counts = Counter()
+    count_event(counts, 'applications', application.created_at, job.employer_id, job.location, delta)
+    add(counts)
+
+
+def record_applications_deleted(applications):
+    """Call before deleting the `applications` queryset: one aggregate query."""
+    counts = Counter()
+    groups = (
+        applications.order_by()
+        .values('created_at__date', 'job__location', 'job__employer_id')
+        .annotate(applications=Count('pk'))
+    )
+    for group in groups.iterator():
+        count_day(
+            counts, 'applications', group['created_at__date'],
+            group['job__employer_id'], group['job__location'], -group['applications'],
+        )
+    add(counts)
+
+
+# ------------------------------------------------------------
+# Backfill
+# ------------------------------------------------------------
+
+def scan(queryset, fields, batch_size):
+    """Yield value rows in primary key order, one batch query at a time."""
+    last = None
+    while True:
+        batch = queryset.order_by('pk')
+        if last is not None:
+            batch = batch.filter(pk__gt=last)
+        rows = list(batch.values_list('pk', *fields)[:batch_size])
+        if not rows:
+            return
+        last = rows[-1][0]
+        yield rows
+
+
+def backfill(since=None, batch_size=BACKFILL_BATCH_SIZE, on_batch=None):
+    """
+    Rebuild the rollups for `since` (a date) onwards, or for all history.
+
+    Jobs and applications are read in primary key batches and counted in
+    memory; the affected days are then replaced in one transaction.
+    `on_batch(rows)` gets
+    the running number of rows read. Returns that number.
+    """
+    live_ids = Job.objects.values('pk')
+    sources = [
+        ('job', Job.objects.all()),
+        ('job', ArchivedJob.objects.exclude(pk__in=live_ids)),
+        ('application', Application.objects.all()),
+        ('application', ArchivedApplication.objects.all()),
+    ]
+    counts = Counter()
+    read = 0
+    for kind, queryset in sources:
+        if since is not None:
+            queryset = queryset.filter(created_at__gte=day_start(since))
+        if kind == 'job':
+            for rows in scan(queryset, ('created_at', 'employer_id', 'location', 'approved'), batch_size):
+                for _, created_at, employer_id, location, approved in rows:
+                    count_event(counts, 'jobs_posted', created_at, employer_id, location)
+                    if approved:
+                        count_event(counts, 'jobs_approved', created_at, employer_id, location)
+                read += len(rows)
+                if on_batch:
+                    on_batch(read)
+        else:
+            for rows in scan(queryset, ('created_at', 'job__employer_id', 'job__location'), batch_size):
+                for _, created_at, employer_id, location in rows:
+                    count_event(counts, 'applications', created_at, employer_id, location)
+                read += len(rows)
+                if on_batch:
+                    on_batch(read)
+
+    with transaction.atomic():
+        stale = StatRollup.objects.all() if since is None else StatRollup.objects.filter(day__gte=since)
+        stale.delete()
+        StatRollup.objects.bulk_create(
+            [
+                StatRollup(metric=metric, dimension=dimension, value=value, day=day, count=count)
+                for (metric, dimension, value, day), count in counts.items() if count
+            ],
+            batch_size=batch_size,
+        )
+    return read
+
+
+# ------------------------------------------------------------
+# Queries
+# ------------------------------------------------------------
+
+def interval_start(day, interval):
+    if interval == 'week':
+        return day - timedelta(days=day.weekday())
+    if interval == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def series(start, end, interval='day', group_by=None, value=None, metrics=METRICS):
+    """
+    Counts per bucket between two dates (inclusive).
+
+    Returns a list of dicts with `bucket`, the location or employer when
+    grouping by one, and one key per metric; buckets with no events are
+    left out. `value` restricts a grouped query to one location or
+    employer. Reads one rollup row per metric, day and group value.
+    """
+    rows = StatRollup.objects.filter(metric__in=metrics, dimension=group_by or '', day__gte=start, day__lte=end).exclude(count=0)
+    if value is not None:
+        rows = rows.filter(value=value)
+    buckets = {}
+    for metric, row_value, day, count in rows.values_list('metric', 'value', 'day', 'count').iterator():
+        key = (interval_start(day, interval), row_value)
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = {'bucket': key[0], **({group_by: row_value} if group_by else {}), **dict.fromkeys(metrics, 0)}
+        bucket[metric] += count
+    return [buckets[key] for key in sorted(buckets)]
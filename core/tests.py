@@ -1,14 +1,60 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from rest_framework.response import Response
 from django.urls import reverse
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from .models import Job, Application, Resume
+from django.core.management import call_command
+from django.db import DatabaseError, connection, connections
+from django.contrib import admin
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from .ids import uuid7_time
+from .imports import iter_json_array
+from .management.commands.profile_imports import parse_importtime
+from .middleware import negotiate_encoding
+from .models import Job, Application, Resume, ArchivedApplication, JobSignature, RescoreQueue, IdempotencyRecord, StatRollup
+from . import replicas
+from .admin import EstimatedCountPaginator, estimated_count
+from . import autocomplete, dedupe
+from .autocomplete import PrefixIndex, autocomplete_index, reset_autocomplete_index
+from .api_views import StudentApplicationsAPIView
+from .renderers import FastJSONRenderer
+from .replicas import ReplicaRouter
+from .schema import generate_schema, schema_cache
+from .scoring import match_score
+from .stats import series
+from .throttling import LocalBucketStore, reset_bucket_store
+from datetime import timedelta
+import csv
+import gzip
+import hashlib
 import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from unittest import mock
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 User = get_user_model()
 
 class JobFinderAPITest(APITestCase):
+    # Replica aliases (DB_REPLICAS=N) mirror default under test.
+    databases = {"default", *settings.DATABASE_REPLICAS}
+
+    @classmethod
+    def setUpClass(cls):
+        # Share the default connection so replica reads see this test's transaction.
+        for alias in settings.DATABASE_REPLICAS:
+            connections[alias] = connections["default"]
+        super().setUpClass()
 
     def setUp(self):
         # Create test users
@@ -25,6 +71,9 @@ class JobFinderAPITest(APITestCase):
         # Initialize client
         self.client = APIClient()
 
+        # Throttle buckets are per process; start every test with full ones
+        reset_bucket_store()
+
     # -----------------------------------------
     # AUTH TESTS
     # -----------------------------------------
@@ -134,3 +183,777 @@ class JobFinderAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         job.refresh_from_db()
         self.assertTrue(job.approved)
+
+    # -----------------------------------------
+    # APPLICANT EXPORT
+    # -----------------------------------------
+    def test_employer_export_applicants_csv(self):
+        job = Job.objects.create(title="Job", description="Desc", location="Loc", duration="1 mo", skills="Python", employer=self.employer, approved=True)
+        Application.objects.create(job=job, student=self.student, match_score=90)
+        self.client.force_authenticate(user=self.employer)
+        url = reverse("employer-job-applications-export", kwargs={"job_id": job.id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(",")[0], "application_id")
+        self.assertIn("student1@test.com", lines[1])
+
+    def test_export_csv_defuses_spreadsheet_formulas(self):
+        job = Job.objects.create(title="Job", description="Desc", location="Loc", duration="1 mo", skills="Python", employer=self.employer, approved=True)
+        names = ['=HYPERLINK("http://evil")', "+1", "-1", "@SUM(A1)", "\tx", "plain"]
+        for i, name in enumerate(names):
+            student = User.objects.create_user(username=name, email=f"s{i}@test.com", password="password123", role="student")
+            Application.objects.create(job=job, student=student, match_score=-5)
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(reverse("employer-job-applications-export", kwargs={"job_id": job.id}))
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual([row["student_username"] for row in rows], ["'" + name for name in names[:-1]] + ["plain"])
+        self.assertEqual({row["match_score"] for row in rows}, {"-5"})
+
+    def test_employer_export_applicants_ndjson(self):
+        job = Job.objects.create(title="Job", description="Desc", location="Loc", duration="1 mo", skills="Python", employer=self.employer, approved=True)
+        Application.objects.create(job=job, student=self.student, match_score=90)
+        self.client.force_authenticate(user=self.employer)
+        url = reverse("employer-job-applications-export", kwargs={"job_id": job.id})
+        response = self.client.get(url, {"type": "ndjson"})
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(rows[0]["student_username"], "student1")
+        self.assertEqual(rows[0]["match_score"], 90)
+
+    def test_employer_cannot_export_other_employers_job(self):
+        other = User.objects.create_user(username="employer2", email="employer2@test.com", password="password123", role="employer")
+        job = Job.objects.create(title="Job", description="Desc", location="Loc", duration="1 mo", skills="Python", employer=other, approved=True)
+        self.client.force_authenticate(user=self.employer)
+        url = reverse("employer-job-applications-export", kwargs={"job_id": job.id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    # -----------------------------------------
+    # BULK JOB IMPORT
+    # -----------------------------------------
+    def test_employer_import_jobs_json_reports_row_errors(self):
+        rows = [
+            {"title": "Dev", "description": "Desc", "location": "Remote", "duration": "3 months", "skills": "Python"},
+            {"title": "Missing fields"},
+            {"title": "QA", "description": "Desc", "location": "Harare", "duration": "6 months"},
+        ]
+        upload = SimpleUploadedFile("jobs.json", json.dumps(rows).encode(), content_type="application/json")
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.post(reverse("employer-job-import"), {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["failed"], 1)
+        self.assertEqual(response.data["errors"][0]["row"], 2)
+        self.assertIn("description", response.data["errors"][0]["errors"])
+        self.assertEqual(Job.objects.filter(employer=self.employer, approved=False).count(), 2)
+
+    def test_employer_import_jobs_csv_and_ndjson(self):
+        csv_body = b"title,description,location,duration,skills\nDev,Desc,Remote,3 months,Python\n"
+        ndjson_body = b'{"title": "QA", "description": "Desc", "location": "Harare", "duration": "1 mo"}\n\n'
+        self.client.force_authenticate(user=self.employer)
+        for name, body in (("jobs.csv", csv_body), ("jobs.ndjson", ndjson_body)):
+            upload = SimpleUploadedFile(name, body, content_type="application/octet-stream")
+            response = self.client.post(reverse("employer-job-import"), {"file": upload}, format="multipart")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(set(Job.objects.values_list("title", flat=True)), {"Dev", "QA"})
+
+    def test_employer_import_jobs_malformed_json(self):
+        upload = SimpleUploadedFile("jobs.json", b'[{"title": "Dev"', content_type="application/json")
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.post(reverse("employer-job-import"), {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("error", response.data)
+
+    def test_json_array_import_requires_single_commas_and_closing_bracket(self):
+        row = '{"title": "Dev", "description": "Desc", "location": "Remote", "duration": "1 mo"}'
+        cases = {
+            f"[{row},,{row}]": 'Expected a value for row 2',
+            f"[{row},]": 'Expected a value for row 2',
+            f"[{row}": 'Unterminated JSON array after row 1',
+            f"[{row} {row}]": 'Expected "," or "]" after row 1',
+            f"[{row}] {row}": 'Unexpected data after the JSON array',
+        }
+        self.client.force_authenticate(user=self.employer)
+        for body, error in cases.items():
+            upload = SimpleUploadedFile("jobs.json", body.encode(), content_type="application/json")
+            response = self.client.post(reverse("employer-job-import"), {"file": upload}, format="multipart")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, body)
+            self.assertEqual(response.data["error"], error)
+        self.assertEqual(list(iter_json_array(io.StringIO(f" [ {row} , {row} ] "), read_size=7)), [json.loads(row)] * 2)
+        self.assertEqual(list(iter_json_array(io.StringIO("[ ]"))), [])
+
+    # -----------------------------------------
+    # SPARSE FIELDSETS
+    # -----------------------------------------
+    def test_job_list_sparse_fields_trim_output_and_sql(self):
+        Job.objects.create(title="Job 1", description="Long text", location="Loc", duration="1 mo", skills="Python", employer=self.employer, approved=True)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("job-list"), {"fields": "id,title"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data[0]), {"id", "title"})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("description", queries[0]["sql"])
+
+    def test_application_list_expand_controls_nesting(self):
+        job = Job.objects.create(title="Job", description="Desc", location="Loc", duration="1 mo", skills="Python", employer=self.employer, approved=True)
+        Application.objects.create(job=job, student=self.student, match_score=90)
+        self.client.force_authenticate(user=self.student)
+        url = reverse("student-applications")
+
+        response = self.client.get(url, {"expand": "job"})
+        self.assertEqual(response.data[0]["job"]["title"], "Job")
+        self.assertEqual(response.data[0]["job"]["employer"], self.employer.id)
+        self.assertEqual(response.data[0]["student"], self.student.id)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.data[0]["job"]["employer"]["username"], "employer1")
+        self.assertEqual(response.data[0]["student"]["username"], "student1")
+
+    # -----------------------------------------
+    # RENDERING AND COMPRESSION
+    # -----------------------------------------
+    def test_fast_json_renderer_round_trip(self):
+        job = Job.objects.create(title="Job\u2028", description="Desc", location="Loc", duration="1 mo", skills="Python", employer=self.employer, approved=True)
+        data = {"id": job.id, "created_at": job.created_at, "title": job.title}
+        body = FastJSONRenderer().render(data)
+        self.assertNotIn(b"\xe2\x80\xa8", body)
+        self.assertEqual(json.loads(body)["id"], str(job.id))
+
+    def test_job_list_is_compressed_when_large(self):
+        for i in range(20):
+            Job.objects.create(title=f"Job {i}", description="Desc " * 50, location="Loc", duration="1 mo", skills="Python", employer=self.employer, approved=True)
+        url = reverse("job-list")
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))), 20)
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+        response = self.client.get(url, {"fields": "id"}, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_accept_encoding_negotiation(self):
+        self.assertEqual(negotiate_encoding("gzip, br", ("br", "gzip")), "br")
+        self.assertEqual(negotiate_encoding("br;q=0.5, gzip", ("br", "gzip")), "gzip")
+        self.assertEqual(negotiate_encoding("*;q=0", ("br", "gzip")), None)
+        self.assertEqual(negotiate_encoding("identity", ("br", "gzip")), None)
+
+    # -----------------------------------------
+    # PRECOMPUTED SCHEMA
+    # -----------------------------------------
+    def test_schema_generated_once_and_served_with_etag(self):
+        with tempfile.TemporaryDirectory() as tmp, override_settings(SCHEMA_CACHE_PATH=os.path.join(tmp, "schema.json")):
+            schema_cache.clear()
+            url = reverse("schema")
+            with mock.patch("core.schema.generate_schema", wraps=generate_schema) as generate:
+                first = self.client.get(url, {"format": "json"})
+                self.assertEqual(first.status_code, status.HTTP_200_OK)
+                self.assertIn("/api/jobs/", json.loads(first.content)["paths"])
+
+                cached = self.client.get(url, {"format": "json"}, HTTP_IF_NONE_MATCH=first["ETag"])
+                self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+                # A fresh process reads the stored artifact instead of regenerating.
+                schema_cache.clear()
+                self.assertEqual(self.client.get(url, {"format": "json"})["ETag"], first["ETag"])
+                self.assertEqual(generate.call_count, 1)
+            schema_cache.clear()
+
+    # -----------------------------------------
+    # BOOT PROFILING
+    # -----------------------------------------
+    def test_parse_importtime_output(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     django.utils\n"
+            "import time:      4621 |       8363 | core.api_views\n"
+        )
+        self.assertEqual(parse_importtime(output), [("django.utils", 120, 120, 2), ("core.api_views", 4621, 8363, 0)])
+
+    def test_api_only_profile_does_not_import_schema_stack(self):
+        script = (
+            "import sys, django; django.setup(); "
+            "from django.urls import resolve; resolve('/api/jobs/'); import core.api_views; "
+            "print(sorted(m for m in sys.modules if m.startswith('drf_spectacular')))"
+        )
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": "zou_jobfinder.settings_api"}
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env, cwd=settings.BASE_DIR, check=True)
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    # -----------------------------------------
+    # THROTTLING
+    # -----------------------------------------
+    @override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {"login_ip": "2/min"}})
+    def test_login_throttled_per_ip_with_retry_after(self):
+        reset_bucket_store()
+        url = reverse("login")
+        data = {"email": "student1@test.com", "password": "wrongpass"}
+        for _ in range(2):
+            self.assertEqual(self.client.post(url, data, format="json").status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "30")
+        # Another client IP has its own bucket.
+        response = self.client.post(url, data, format="json", REMOTE_ADDR="10.0.0.2")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        # A forged X-Forwarded-For does not buy a fresh bucket.
+        response = self.client.post(url, data, format="json", HTTP_X_FORWARDED_FOR="203.0.113.7")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        reset_bucket_store()
+
+    @override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {"apply_user": "1/hour"}})
+    def test_apply_throttled_per_user(self):
+        reset_bucket_store()
+        jobs = [Job.objects.create(title=f"Job {i}", description="Desc", location="Loc", duration="1 mo", skills="Python", employer=self.employer, approved=True) for i in range(2)]
+        self.client.force_authenticate(user=self.student)
+        self.assertEqual(self.client.post(reverse("apply-job", kwargs={"job_id": jobs[0].id})).status_code, status.HTTP_201_CREATED)
+        response = self.client.post(reverse("apply-job", kwargs={"job_id": jobs[1].id}))
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertFalse(Application.objects.filter(job=jobs[1]).exists())
+        reset_bucket_store()
+
+    def test_local_bucket_store_refills(self):
+        store = LocalBucketStore()
+        store.clock = lambda: 100.0
+        self.assertEqual(store.consume("k", 1, 0.5), 0)
+        self.assertEqual(store.consume("k", 1, 0.5), 2.0)
+        store.clock = lambda: 102.0
+        self.assertEqual(store.consume("k", 1, 0.5), 0)
+
+    def test_local_bucket_store_evicts_least_recently_used(self):
+        store = LocalBucketStore(max_keys=2)
+        store.consume("a", 1, 0.5)
+        store.consume("b", 1, 0.5)
+        store.consume("a", 1, 0.5)
+        store.consume("c", 1, 0.5)
+        self.assertEqual(list(store.buckets), ["a", "c"])
+
+    def test_local_bucket_store_concurrent_consume_at_max_keys(self):
+        class YieldingDict(OrderedDict):
+            # Give other threads a chance to run between an insert and move_to_end().
+            def __setitem__(self, key, value):
+                super().__setitem__(key, value)
+                time.sleep(0.0001)
+
+        store = LocalBucketStore(stripes=8, max_keys=4)
+        store.buckets = YieldingDict()
+        errors = []
+
+        def hammer(worker):
+            try:
+                for i in range(300):
+                    store.consume(f"{worker}-{i % 7}", 5, 1.0)
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=hammer, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(store.buckets), 4)
+
+    # -----------------------------------------
+    # ARCHIVAL
+    # -----------------------------------------
+    def test_archive_expired_jobs_moves_rows_and_keeps_history(self):
+        old = Job.objects.create(title="Old", description="Desc", location="Loc", duration="1 mo", skills="Python", employer=self.employer, approved=True)
+        fresh = Job.objects.create(title="Fresh", description="Desc", location="Loc", duration="1 mo", skills="Python", employer=self.employer, approved=True)
+        Job.objects.filter(id=old.id).update(created_at=timezone.now() - timedelta(days=400))
+        app = Application.objects.create(job=old, student=self.student, match_score=70)
+        Resume.objects.create(student=self.student, file="resumes/cv.pdf")
+
+        call_command("archive_expired_jobs", "--batch-size", "1", "--pause", "0", stdout=io.StringIO())
+
+        self.assertEqual(list(Job.objects.values_list("id", flat=True)), [fresh.id])
+        self.assertFalse(Application.objects.exists())
+        archived = ArchivedApplication.objects.get(id=app.id)
+        self.assertEqual(archived.job_id, old.id)
+        self.assertEqual(archived.resume_file.name, "resumes/cv.pdf")
+
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(reverse("employer-job-history"))
+        self.assertEqual([job["title"] for job in response.data], ["Old"])
+        response = self.client.get(reverse("employer-job-history-applications", kwargs={"job_id": old.id}))
+        self.assertEqual(response.data[0]["match_score"], 70)
+
+        self.client.force_authenticate(user=self.student)
+        response = self.client.get(reverse("student-application-history"))
+        self.assertEqual(response.data[0]["job"]["title"], "Old")
+
+    # -----------------------------------------
+    # TALENT SEARCH
+    # -----------------------------------------
+    def upload_resume_as(self, student, content):
+        self.client.force_authenticate(user=student)
+        upload = SimpleUploadedFile("cv.txt", content.encode(), content_type="text/plain")
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            return self.client.post(reverse("upload-resume"), {"file": upload}, format="multipart")
+
+    def test_resume_upload_survives_corrupt_pdf_and_skips_binaries(self):
+        self.client.force_authenticate(user=self.student)
+        uploads = [
+            SimpleUploadedFile("cv.pdf", b"%PDF-1.7\n1 0 obj << /Type /Catalog /Pages 2 0 R", content_type="application/pdf"),
+            SimpleUploadedFile("cv.docx", b"PK\x03\x04Python\x00\xff\xfe", content_type="application/octet-stream"),
+            SimpleUploadedFile("cv.txt", b"Python\x00\xff\xfe", content_type="text/plain"),
+        ]
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            for upload in uploads:
+                response = self.client.post(reverse("upload-resume"), {"file": upload}, format="multipart")
+                self.assertEqual(response.status_code, status.HTTP_201_CREATED, upload.name)
+        self.assertEqual(set(Resume.objects.values_list("text", "skills")), {("", "")})
+
+    def test_employer_talent_search_ranks_own_applicants(self):
+        job = Job.objects.create(title="Job", description="Desc", location="Loc", duration="1 mo", skills="Python", employer=self.employer, approved=True)
+        other_employer = User.objects.create_user(username="employer2", email="employer2@test.com", password="password123", role="employer")
+        other_job = Job.objects.create(title="Job", description="Desc", location="Loc", duration="1 mo", skills="Python", employer=other_employer, approved=True)
+        student2 = User.objects.create_user(username="student2", email="student2@test.com", password="password123", role="student")
+        outsider = User.objects.create_user(username="student3", email="student3@test.com", password="password123", role="student")
+        Application.objects.create(job=job, student=self.student)
+        Application.objects.create(job=job, student=student2)
+        Application.objects.create(job=other_job, student=outsider)
+
+        response = self.upload_resume_as(self.student, "Backend developer. Built Django REST APIs with Python and PostgreSQL.")
+        self.assertEqual(response.data["skills"], "Django, Python, PostgreSQL")
+        self.upload_resume_as(student2, "Sales and marketing, some Python scripting.")
+        self.upload_resume_as(outsider, "Django Django Django developer.")
+
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(reverse("employer-talent-search"), {"q": "django developers"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["student"]["username"] for row in response.data], ["student1"])
+        self.assertIn("<mark>Django</mark>", response.data[0]["snippet"])
+
+        response = self.client.get(reverse("employer-talent-search"), {"q": 'python "OR'})
+        self.assertEqual({row["student"]["username"] for row in response.data}, {"student1", "student2"})
+
+        # A new upload replaces the student's indexed resume.
+        self.upload_resume_as(self.student, "Accountant with Excel skills.")
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(reverse("employer-talent-search"), {"q": "django"})
+        self.assertEqual(response.data, [])
+
+    def test_talent_search_snippet_escapes_resume_html(self):
+        job = Job.objects.create(title="Job", description="Desc", location="Loc", duration="1 mo", skills="Python", employer=self.employer, approved=True)
+        Application.objects.create(job=job, student=self.student)
+        self.upload_resume_as(self.student, 'Python <img src=x onerror=alert(1)> & <mark>Django</mark> "dev"')
+
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(reverse("employer-talent-search"), {"q": "python"})
+        self.assertEqual(
+            response.data[0]["snippet"],
+            "<mark>Python</mark> &lt;img src=x onerror=alert(1)&gt; &amp; &lt;mark&gt;Django&lt;/mark&gt; &quot;dev&quot;",
+        )
+
+    # -----------------------------------------
+    # DUPLICATE DETECTION
+    # -----------------------------------------
+    def test_duplicate_jobs_flagged_on_create_and_in_pending_queue(self):
+        description = "Looking for a motivated individual to join our engineering team and build APIs."
+        original = Job.objects.create(title="Software Engineer", description=description, skills="Python, Django", employer=self.employer)
+        Job.objects.create(title="Accountant", description="Prepare monthly statements and audits.", skills="Excel", employer=self.employer)
+        # Jobs created outside the API are picked up by `cluster_duplicate_jobs --rebuild`.
+        call_command("cluster_duplicate_jobs", "--rebuild", stdout=io.StringIO())
+
+        self.client.force_authenticate(user=self.employer)
+        data = {"title": "Software Engineer", "description": description + "!", "location": "Harare", "duration": "6 months", "skills": "Django, Python"}
+        response = self.client.post(reverse("employer-job-create"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([row["id"] for row in response.data["possible_duplicates"]], [str(original.id)])
+        self.assertEqual(response.data["possible_duplicates"][0]["similarity"], 1.0)
+
+        # Another employer's postings are never revealed to an employer.
+        other_employer = User.objects.create_user(username="employer2", email="employer2@test.com", password="password123", role="employer")
+        self.client.force_authenticate(user=other_employer)
+        response = self.client.post(reverse("employer-job-create"), data, format="json")
+        self.assertEqual(response.data["possible_duplicates"], [])
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse("pending-jobs"), {"fields": "id,title"})
+        flagged = {row["title"]: len(row["possible_duplicates"]) for row in response.data}
+        self.assertEqual(flagged, {"Software Engineer": 2, "Accountant": 0})
+
+        out = io.StringIO()
+        call_command("cluster_duplicate_jobs", "--rebuild", stdout=out)
+        self.assertIn("1 clusters, 2 redundant postings", out.getvalue())
+
+    def test_duplicate_lookup_caps_each_bucket_in_sql(self):
+        jobs = [Job.objects.create(title="Warehouse Assistant", description="Boilerplate text.", employer=self.employer) for _ in range(6)]
+        dedupe.index_jobs(jobs)
+        with mock.patch("core.dedupe.MAX_CANDIDATES", 3), CaptureQueriesContext(connection) as queries:
+            duplicates = dedupe.find_duplicates(jobs[-1])
+        # The job itself and the two most recently indexed others.
+        self.assertEqual({row["id"] for row in duplicates}, {jobs[-2].id, jobs[-3].id})
+        lookup = next(q["sql"] for q in queries.captured_queries if "core_joblshbucket" in q["sql"])
+        self.assertIn("ROW_NUMBER()", lookup)
+
+    # -----------------------------------------
+    # TIME-ORDERED IDS
+    # -----------------------------------------
+    def test_new_ids_are_time_ordered_uuid7(self):
+        jobs = [Job.objects.create(title=f"Job {i}", description="Desc", employer=self.employer) for i in range(5)]
+        self.assertTrue(all(job.id.version == 7 for job in jobs))
+        self.assertEqual(list(Job.objects.order_by("id")), jobs)
+
+    def test_rekey_uuid7_moves_foreign_keys_and_keeps_old_urls(self):
+        old_id = uuid.uuid4()
+        job = Job.objects.create(id=old_id, title="Job", description="Desc", employer=self.employer, approved=True)
+        application = Application.objects.create(job=job, student=self.student)
+        call_command("cluster_duplicate_jobs", "--rebuild", stdout=io.StringIO())
+
+        call_command("rekey_uuid7", "--model", "job", stdout=io.StringIO())
+        job = Job.objects.get()
+        self.assertEqual(job.id.version, 7)
+        self.assertEqual(uuid7_time(job.id), int(job.created_at.timestamp() * 1000))
+        self.assertEqual(Application.objects.get(pk=application.pk).job_id, job.id)
+        self.assertTrue(JobSignature.objects.filter(job=job).exists())
+
+        response = self.client.get(reverse("job-detail", kwargs={"job_id": old_id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["id"], str(job.id))
+
+    # -----------------------------------------
+    # RESCORING
+    # -----------------------------------------
+    def test_match_scores_follow_job_and_resume_changes(self):
+        job = Job.objects.create(title="Job", description="Desc", location="Loc", duration="1 mo", skills="Python, Django", employer=self.employer, approved=True)
+        self.upload_resume_as(self.student, "Python developer.")
+        self.client.force_authenticate(user=self.student)
+        response = self.client.post(reverse("apply-job", kwargs={"job_id": job.id}))
+        self.assertEqual(response.data["match_score"], 50)
+
+        # A new resume rescores the student's applications once the upload commits,
+        # but leaves other users' queued pairs to the command.
+        student2 = User.objects.create_user(username="student2", email="student2@test.com", password="password123", role="student")
+        RescoreQueue.objects.create(job=job, student=student2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.upload_resume_as(self.student, "Python and Django developer.")
+        self.assertEqual(Application.objects.get().match_score, 100)
+        self.assertEqual(list(RescoreQueue.objects.values_list("student", flat=True)), [student2.pk])
+        RescoreQueue.objects.all().delete()
+
+        # Queued pairs beyond the inline limit wait for the command.
+        self.client.force_authenticate(user=self.employer)
+        with override_settings(RESCORE_INLINE_LIMIT=0), self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse("employer-job-update", kwargs={"job_id": job.id}), {"skills": "Python, Django, SQL, Docker"}, format="json")
+            self.client.patch(reverse("employer-job-update", kwargs={"job_id": job.id}), {"skills": "Python, SQL, Docker, AWS"}, format="json")
+        self.assertEqual(RescoreQueue.objects.count(), 1)
+        self.assertEqual(Application.objects.get().match_score, 100)
+
+        out = io.StringIO()
+        call_command("rescore_applications", stdout=out)
+        self.assertIn("1 queued pairs rescored, 1 changed", out.getvalue())
+        self.assertEqual(Application.objects.get().match_score, 25)
+        self.assertFalse(RescoreQueue.objects.exists())
+
+        Application.objects.update(match_score=0)
+        call_command("rescore_applications", "--all", stdout=out)
+        self.assertEqual(Application.objects.get().match_score, 25)
+
+    # -----------------------------------------
+    # READ REPLICAS
+    # -----------------------------------------
+    def test_replica_router_pins_writes_to_primary(self):
+        router = ReplicaRouter()
+        with override_settings(DATABASE_REPLICAS=["replica1"]):
+            self.assertIsNone(router.db_for_read(Job))
+            with replicas.routing() as state:
+                state.use_replica = True
+                self.assertEqual(router.db_for_read(Job), "replica1")
+                self.assertEqual(router.db_for_write(Job), "default")
+                self.assertIsNone(router.db_for_read(Job))
+            self.assertFalse(router.allow_migrate("replica1", "core"))
+            self.assertTrue(router.allow_migrate("default", "core"))
+
+    def test_list_views_read_from_replica_unless_client_just_wrote(self):
+        job = Job.objects.create(title="Job", description="Desc", location="Loc", duration="1 mo", skills="Python", employer=self.employer, approved=True)
+        routed = []
+
+        def list_view(view, request, *args, **kwargs):
+            routed.append(replicas.read_alias())
+            return Response([])
+
+        self.client.force_authenticate(user=self.student)
+        with override_settings(DATABASE_REPLICAS=["replica1"]), mock.patch.object(StudentApplicationsAPIView, "list", autospec=True, side_effect=list_view):
+            self.client.get(reverse("student-applications"))
+            self.client.post(reverse("apply-job", kwargs={"job_id": job.id}))
+            self.client.get(reverse("student-applications"))
+            with override_settings(REPLICA_STICKY_SECONDS=0):
+                self.client.get(reverse("student-applications"))
+        self.assertEqual(routed, ["replica1", None, "replica1"])
+
+    # -----------------------------------------
+    # DJANGO ADMIN
+    # -----------------------------------------
+    def test_admin_changelists_and_bulk_job_actions(self):
+        jobs = [Job.objects.create(title=f"Job {i}", description="Desc", employer=self.employer) for i in range(3)]
+        Application.objects.create(job=jobs[0], student=self.student)
+        self.client.force_login(self.admin)
+        for name in ("core_user", "core_job", "core_application", "core_resume"):
+            response = self.client.get(reverse(f"admin:{name}_changelist"), {"q": "x"})
+            self.assertEqual(response.status_code, 200, name)
+
+        url = reverse("admin:core_job_changelist")
+        data = {"action": "approve_jobs", "_selected_action": [str(job.id) for job in jobs[:2]]}
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(url, data)
+        updates = [q["sql"] for q in queries.captured_queries if q["sql"].startswith('UPDATE "core_job"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(Job.objects.filter(approved=True).count(), 2)
+
+        # However many jobs are selected: one aggregate for the rollups, one
+        # read for autocomplete, one UPDATE, and the three rollup rows it
+        # touches, inside a savepoint.
+        Job.objects.bulk_create([Job(title=f"Bulk {i}", description="Desc", employer=self.employer) for i in range(50)])
+        job_admin = admin.site._registry[Job]
+        with self.assertNumQueries(8):
+            self.assertEqual(job_admin.set_approved(Job.objects.all(), True), 51)
+        self.assertFalse(Job.objects.filter(approved=False).exists())
+        today = timezone.localdate()
+        self.assertEqual(series(today, today, metrics=("jobs_approved",))[0]["jobs_approved"], 53)
+
+    def test_admin_edits_and_deletes_keep_rollups_and_indexes(self):
+        reset_autocomplete_index()
+        self.addCleanup(reset_autocomplete_index)
+        autocomplete_index()
+        self.client.force_login(self.admin)
+        data = {"employer": str(self.employer.id), "title": "Golang Engineer", "description": "Desc", "location": "Remote", "duration": "", "skills": "Go"}
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("admin:core_job_add"), data)
+        self.assertEqual(response.status_code, 302)
+        job = Job.objects.get(title="Golang Engineer")
+        self.assertTrue(JobSignature.objects.filter(job=job).exists())
+        Resume.objects.create(student=self.student, file="resumes/cv.pdf", skills="Python")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("admin:core_application_add"), {"job": str(job.id), "student": str(self.student.id), "status": "Pending", "match_score": 0})
+
+        # Approving, moving and re-skilling from the change form.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("admin:core_job_change", args=[job.id]), {**data, "location": "Lagos", "skills": "Go, Python", "approved": "on"})
+        today = timezone.localdate()
+        by_location = {row["location"]: row for row in series(today, today, group_by="location")}
+        self.assertEqual(list(by_location), ["Lagos"])
+        self.assertEqual((by_location["Lagos"]["jobs_posted"], by_location["Lagos"]["jobs_approved"], by_location["Lagos"]["applications"]), (1, 1, 1))
+        self.assertEqual(autocomplete_index().suggest("lag")["location"], [("Lagos", 1)])
+        self.assertEqual(Application.objects.get().match_score, match_score("Go, Python", "Python"))
+        self.assertGreater(match_score("Go, Python", "Python"), match_score("Go", "Python"))
+        before = sorted(StatRollup.objects.exclude(count=0).values_list("metric", "dimension", "value", "day", "count"))
+        call_command("backfill_stats", stdout=io.StringIO())
+        self.assertEqual(sorted(StatRollup.objects.values_list("metric", "dimension", "value", "day", "count")), before)
+
+        # delete_selected takes the job and its applications off everything.
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("admin:core_job_changelist"), {"action": "delete_selected", "_selected_action": [str(job.id)], "post": "yes"})
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Job.objects.exists())
+        self.assertEqual(series(today, today), [])
+        self.assertEqual(autocomplete_index().suggest("go")["title"], [])
+
+    def test_admin_search_uses_indexes(self):
+        job = Job.objects.create(title="Python Developer", description="Desc", employer=self.employer)
+        request = RequestFactory().get("/")
+        for model in (User, Job, Application, Resume):
+            model_admin = admin.site._registry[model]
+            queryset, _ = model_admin.get_search_results(request, model_admin.get_queryset(request), "employer1@test.com")
+            plan = queryset.explain()
+            self.assertNotRegex(plan, r"\bSCAN core_", model.__name__)
+            self.assertIn("USING INDEX", plan, model.__name__)
+
+        job_admin = admin.site._registry[Job]
+        found, _ = job_admin.get_search_results(request, Job.objects.all(), "Python Dev")
+        self.assertEqual(list(found), [job])
+        found, _ = job_admin.get_search_results(request, Job.objects.all(), "employer1@test.com")
+        self.assertEqual(list(found), [job])
+
+    def test_admin_paginator_estimates_large_unfiltered_counts(self):
+        Job.objects.bulk_create([Job(title="Job", description="Desc", employer=self.employer) for _ in range(30)])
+        with mock.patch("core.admin.EXACT_COUNT_LIMIT", 10), mock.patch("core.admin.estimated_count", return_value=1_000_000):
+            self.assertEqual(EstimatedCountPaginator(Job.objects.order_by("-created_at"), 50).count, 1_000_000)
+            self.assertEqual(EstimatedCountPaginator(Job.objects.filter(approved=False).order_by("-created_at"), 50).count, 11)
+        self.assertEqual(EstimatedCountPaginator(Job.objects.filter(approved=False).order_by("-created_at"), 50).count, 30)
+        self.assertGreaterEqual(estimated_count(Job), 30)
+
+    # -----------------------------------------
+    # IDEMPOTENCY KEYS
+    # -----------------------------------------
+    def test_idempotency_key_replays_first_response(self):
+        job = Job.objects.create(title="Job", description="Desc", employer=self.employer, approved=True)
+        self.client.force_authenticate(user=self.student)
+        url = reverse("apply-job", kwargs={"job_id": job.id})
+        first = self.client.post(url, HTTP_IDEMPOTENCY_KEY="apply-1")
+        retry = self.client.post(url, HTTP_IDEMPOTENCY_KEY="apply-1")
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(Application.objects.count(), 1)
+        # Without a key a second apply is still rejected as a duplicate.
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_400_BAD_REQUEST)
+
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            for _ in range(2):
+                upload = SimpleUploadedFile("cv.txt", b"Python developer", content_type="text/plain")
+                response = self.client.post(reverse("upload-resume"), {"file": upload}, format="multipart", HTTP_IDEMPOTENCY_KEY="cv-1")
+                self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Resume.objects.filter(student=self.student).count(), 1)
+
+        self.client.force_authenticate(user=self.employer)
+        data = {"title": "Dev", "description": "Desc", "location": "Remote", "duration": "3 months"}
+        self.client.post(reverse("employer-job-create"), data, HTTP_IDEMPOTENCY_KEY="job-1")
+        self.client.post(reverse("employer-job-create"), data, HTTP_IDEMPOTENCY_KEY="job-1")
+        self.assertEqual(Job.objects.filter(title="Dev").count(), 1)
+        response = self.client.post(reverse("employer-job-create"), {**data, "title": "Other"}, HTTP_IDEMPOTENCY_KEY="job-1")
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_idempotency_key_in_flight_conflict_and_abandoned_claim(self):
+        job = Job.objects.create(title="Job", description="Desc", employer=self.employer, approved=True)
+        url = reverse("apply-job", kwargs={"job_id": job.id})
+        record = IdempotencyRecord.objects.create(
+            user=self.student, route=f"POST {url}", key="k", fingerprint=hashlib.sha256(b"[]").hexdigest(),
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+        self.client.force_authenticate(user=self.student)
+        response = self.client.post(url, HTTP_IDEMPOTENCY_KEY="k")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertIn("Retry-After", response)
+
+        IdempotencyRecord.objects.filter(pk=record.pk).update(created_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(self.client.post(url, HTTP_IDEMPOTENCY_KEY="k").status_code, status.HTTP_201_CREATED)
+
+        IdempotencyRecord.objects.update(expires_at=timezone.now())
+        call_command("purge_idempotency_keys", stdout=io.StringIO())
+        self.assertFalse(IdempotencyRecord.objects.exists())
+
+    # -----------------------------------------
+    # ANALYTICS ROLLUPS
+    # -----------------------------------------
+    def test_stats_rollups_follow_write_paths_and_backfill(self):
+        self.client.force_authenticate(user=self.employer)
+        data = {"title": "Dev", "description": "Desc", "location": "Remote", "duration": "3 months"}
+        job_id = self.client.post(reverse("employer-job-create"), data).data["id"]
+        self.client.post(reverse("employer-job-create"), {**data, "location": "Berlin"})
+        self.client.force_authenticate(user=self.admin)
+        self.client.post(reverse("approve-job", kwargs={"job_id": job_id}))
+        self.client.post(reverse("approve-job", kwargs={"job_id": job_id}))
+        self.client.force_authenticate(user=self.student)
+        self.client.post(reverse("apply-job", kwargs={"job_id": job_id}))
+
+        self.client.force_authenticate(user=self.admin)
+        today = timezone.localdate().isoformat()
+        response = self.client.get(reverse("admin-stats"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["buckets"], [{"bucket": today, "jobs_posted": 2, "jobs_approved": 1, "applications": 1}])
+        by_location = self.client.get(reverse("admin-stats"), {"group_by": "location", "interval": "month"}).data["buckets"]
+        self.assertEqual(
+            [(row["location"], row["jobs_posted"], row["jobs_approved"]) for row in by_location],
+            [("Berlin", 1, 0), ("Remote", 1, 1)],
+        )
+        employer = self.client.get(reverse("admin-stats"), {"group_by": "employer", "value": str(self.employer.id)}).data["buckets"]
+        self.assertEqual(employer[0]["applications"], 1)
+        self.assertEqual(self.client.get(reverse("admin-stats"), {"start": "2020-02-30"}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(reverse("admin-stats"), {"group_by": "title"}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(user=self.student)
+        self.assertEqual(self.client.get(reverse("admin-stats")).status_code, status.HTTP_403_FORBIDDEN)
+
+        # Moving a job carries its approval and applications along; deleting one takes its counts off.
+        self.client.force_authenticate(user=self.employer)
+        other = Job.objects.get(location="Berlin")
+        self.client.patch(reverse("employer-job-update", kwargs={"job_id": job_id}), {"location": "Paris"})
+        self.client.delete(reverse("employer-job-delete", kwargs={"job_id": other.id}))
+        self.client.force_authenticate(user=self.admin)
+        by_location = self.client.get(reverse("admin-stats"), {"group_by": "location"}).data["buckets"]
+        self.assertEqual(
+            {row["location"]: (row["jobs_posted"], row["jobs_approved"], row["applications"]) for row in by_location},
+            {"Paris": (1, 1, 1)},
+        )
+        self.assertEqual(self.client.get(reverse("admin-stats")).data["buckets"][0]["jobs_posted"], 1)
+
+        # Jobs written straight to the database are picked up by a backfill.
+        old = Job.objects.create(title="Old", description="Desc", location="Remote", employer=self.employer, approved=True)
+        Job.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=40))
+        before = sorted(StatRollup.objects.exclude(count=0).values_list("metric", "dimension", "value", "day", "count"))
+        call_command("backfill_stats", batch_size=1, stdout=io.StringIO())
+        after = sorted(StatRollup.objects.filter(day=timezone.localdate()).values_list("metric", "dimension", "value", "day", "count"))
+        self.assertEqual(after, before)
+        self.assertEqual(StatRollup.objects.get(metric="jobs_approved", dimension="", day=timezone.localdate() - timedelta(days=40)).count, 1)
+
+    # -----------------------------------------
+    # AUTOCOMPLETE
+    # -----------------------------------------
+    def test_autocomplete_suggests_by_frequency_and_follows_changes(self):
+        reset_autocomplete_index()
+        self.addCleanup(reset_autocomplete_index)
+        for title, skills, location in [
+            ("Python Developer", "Python, Django", "Remote"),
+            ("Python Developer", "python, SQL", "Rome"),
+            ("Product Manager", "Roadmaps", "Remote"),
+        ]:
+            Job.objects.create(title=title, description="Desc", skills=skills, location=location, employer=self.employer, approved=True)
+        pending = Job.objects.create(title="Pyramid Engineer", description="Desc", skills="Pyramid", location="Paris", employer=self.employer)
+
+        url = reverse("job-autocomplete")
+        response = self.client.get(url, {"q": "p"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["title"], [{"value": "Python Developer", "count": 2}, {"value": "Product Manager", "count": 1}])
+        self.assertEqual(response.data["skills"], [{"value": "Python", "count": 2}])
+        self.assertEqual(self.client.get(url, {"q": "R", "field": "location"}).data, {"location": [
+            {"value": "Remote", "count": 2}, {"value": "Rome", "count": 1},
+        ]})
+        self.assertEqual(self.client.get(url, {"q": "r", "field": "location", "limit": 1}).data["location"][0]["value"], "Remote")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {"q": "p", "field": "description"}).status_code, status.HTTP_400_BAD_REQUEST)
+
+        # Approve, update and delete adjust the built index once they commit.
+        self.client.force_authenticate(user=self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("approve-job", kwargs={"job_id": pending.id}))
+        self.assertEqual(self.client.get(url, {"q": "pyr", "field": "skills"}).data["skills"], [{"value": "Pyramid", "count": 1}])
+        self.client.force_authenticate(user=self.employer)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse("employer-job-update", kwargs={"job_id": pending.id}), {"location": "Prague"})
+        self.assertEqual(self.client.get(url, {"q": "pa", "field": "location"}).data["location"], [])
+        self.assertEqual(self.client.get(url, {"q": "pr", "field": "location"}).data["location"], [{"value": "Prague", "count": 1}])
+        # A delete that rolls back leaves the index alone.
+        with self.captureOnCommitCallbacks(execute=True), mock.patch.object(Job, "delete", side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.client.delete(reverse("employer-job-delete", kwargs={"job_id": pending.id}))
+        self.assertEqual(self.client.get(url, {"q": "pyr", "field": "skills"}).data["skills"], [{"value": "Pyramid", "count": 1}])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse("employer-job-delete", kwargs={"job_id": pending.id}))
+        self.assertEqual(self.client.get(url, {"q": "pyr"}).data, {"title": [], "skills": [], "location": []})
+
+    def test_autocomplete_rebuilds_in_background_and_skips_stale_deltas(self):
+        reset_autocomplete_index()
+        self.addCleanup(reset_autocomplete_index)
+        job = Job.objects.create(title="Rust Engineer", description="Desc", skills="Rust", location="Oslo", employer=self.employer)
+        autocomplete_index()
+
+        # A change made before a rebuild is not counted again on top of it.
+        self.client.force_authenticate(user=self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("approve-job", kwargs={"job_id": job.id}))
+            autocomplete.build_index()
+        self.assertEqual(autocomplete_index().suggest("rust")["skills"], [("Rust", 1)])
+
+        # A stale index is served while a single background thread rebuilds it.
+        index = autocomplete_index()
+        with override_settings(AUTOCOMPLETE_MAX_AGE=0), mock.patch("core.autocomplete.threading.Thread") as thread:
+            self.assertIs(autocomplete_index(), index)
+            self.assertIs(autocomplete_index(), index)
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once()
+        autocomplete.build_index()
+        autocomplete._index_lock.release()
+        self.assertIsNot(autocomplete_index(), index)
+
+    def test_prefix_index_keeps_most_used_terms(self):
+        index = PrefixIndex([("Go", 5), ("Java", 1), ("Golang", 3), ("Kotlin", 2)], max_terms=3)
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.top("go", 10), [("Go", 5), ("Golang", 3)])
+        self.assertEqual(index.top("j", 10), [])
+        index.add("Go", -5)
+        index.add("Gleam", 1)
+        self.assertEqual(index.top("g", 10), [("Golang", 3), ("Gleam", 1)])
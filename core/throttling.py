@@ -0,0 +1,186 @@
+import math
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+# ============================================================
+# TOKEN BUCKET THROTTLING
+# ============================================================
+# Views opt in with `throttle_scope = 'login'` and the bucket throttles below.
+# Rates live in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] under '<scope>_ip',
+# '<scope>_user' and '<scope>_account' using DRF's "<requests>/<period>"
+# syntax; a missing rate disables that dimension. A rate of "10/min" allows
+# bursts of 10 and refills one token every 6 seconds.
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate):
+    """Turn "10/min" into (capacity, tokens per second)."""
+    num, period = rate.split('/')
+    capacity = int(num)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+class LocalBucketStore:
+    """
+    Per-process buckets in an LRU dict, guarded by striped locks.
+
+    Each key hashes to one of `stripes` locks held while its bucket is
+    refilled and charged, so unrelated clients rarely contend. The dict
+    itself is only touched under `lock`, held for a lookup or an
+    insert-and-evict at a time. At most `max_keys` buckets are kept; beyond
+    that the least recently used are dropped, so keys chosen by clients
+    (such as the submitted email) cannot grow memory or per-request work
+    without bound.
+    """
+
+    clock = staticmethod(time.monotonic)
+
+    def __init__(self, stripes=64, max_keys=100_000):
+        self.buckets = OrderedDict()
+        self.locks = [threading.Lock() for _ in range(stripes)]
+        self.max_keys = max_keys
+        self.lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate):
+        """Take one token; return 0 when allowed, else seconds until a token is available."""
+        now = self.clock()
+        with self.locks[zlib.crc32(key.encode()) % len(self.locks)]:
+            with self.lock:
+                tokens, last = self.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * refill_rate)
+            if tokens >= 1:
+                tokens, wait = tokens - 1, 0.0
+            else:
+                wait = (1 - tokens) / refill_rate
+            with self.lock:
+                self.buckets[key] = (tokens, now)
+                self.buckets.move_to_end(key)
+                while len(self.buckets) > self.max_keys:
+                    self.buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class CacheBucketStore:
+    """
+    Buckets in a Django cache shared by every worker process.
+
+    Reads and writes are not atomic across processes, so concurrent bursts
+    can slightly over-admit; that trade keeps it to one get and one set.
+    """
+
+    clock = staticmethod(time.time)
+
+    def __init__(self, alias=None):
+        self.cache = caches[alias or getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')]
+
+    def consume(self, key, capacity, refill_rate):
+        now = self.clock()
+        cache_key = f'throttle:{key}'
+        tokens, last = self.cache.get(cache_key, (capacity, now))
+        tokens = min(capacity, tokens + (now - last) * refill_rate)
+        if tokens >= 1:
+            tokens, wait = tokens - 1, 0.0
+        else:
+            wait = (1 - tokens) / refill_rate
+        # Once a bucket would be full again there is nothing worth keeping.
+        self.cache.set(cache_key, (tokens, now), timeout=math.ceil(capacity / refill_rate) + 1)
+        return wait
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def bucket_store():
+    """The process-wide store named by settings.THROTTLE_BUCKET_STORE."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                path = getattr(settings, 'THROTTLE_BUCKET_STORE', 'core.throttling.LocalBucketStore')
+                _store = import_string(path)()
+    return _store
+
+
+def reset_bucket_store():
+    global _store
+    _store = None
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Base token bucket throttle; subclasses say which dimension they key on."""
+
+    dimension = None
+
+    def get_ident_key(self, request):
+        raise NotImplementedError('.get_ident_key() must be overridden')
+
+    def get_rate(self, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if scope is None:
+            raise ImproperlyConfigured(f'{type(view).__name__} uses {type(self).__name__} without a throttle_scope')
+        return scope, api_settings.DEFAULT_THROTTLE_RATES.get(f'{scope}_{self.dimension}')
+
+    def allow_request(self, request, view):
+        scope, rate = self.get_rate(view)
+        if rate is None:
+            return True
+        ident = self.get_ident_key(request)
+        if ident is None:
+            return True
+        capacity, refill_rate = parse_rate(rate)
+        self.retry_after = bucket_store().consume(f'{scope}:{self.dimension}:{ident}', capacity, refill_rate)
+        return self.retry_after == 0
+
+    def wait(self):
+        return self.retry_after
+
+
+class IPBucketThrottle(TokenBucketThrottle):
+    """
+    Bucket per client IP, as DRF's get_ident sees it: REMOTE_ADDR unless
+    REST_FRAMEWORK['NUM_PROXIES'] says how many trusted proxies append to
+    X-Forwarded-For.
+    """
+
+    dimension = 'ip'
+
+    def get_ident_key(self, request):
+        return self.get_ident(request)
+
+
+class UserBucketThrottle(TokenBucketThrottle):
+    """Bucket per authenticated user; anonymous requests are left to the IP bucket."""
+
+    dimension = 'user'
+
+    def get_ident_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return str(request.user.pk)
+        return None
+
+
+class AccountBucketThrottle(TokenBucketThrottle):
+    """Bucket per targeted account (the submitted email), for login attempts spread over many IPs."""
+
+    dimension = 'account'
+
+    def get_ident_key(self, request):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        return email.strip().lower() if isinstance(email, str) and email.strip() else None
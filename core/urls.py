@@ -1,7 +1,10 @@
-from django.urls import path
+from django.urls import path, register_converter
 from . import api_views, auth_views
+from .converters import RecordIdConverter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-    
+
+register_converter(RecordIdConverter, 'record_id')
+
 urlpatterns = [
     # AUTH ROUTES
     path('api/register/', auth_views.RegisterAPIView.as_view(), name='register'),
@@ -11,20 +14,28 @@ urlpatterns = [
 
     # STUDENT ROUTES
     path('api/jobs/', api_views.JobListAPIView.as_view(), name='job-list'),
-    path('api/jobs/<uuid:job_id>/', api_views.JobDetailAPIView.as_view(), name='job-detail'),
-    path('api/apply/<uuid:job_id>/', api_views.ApplyJobAPIView.as_view(), name='apply-job'),
+    path('api/jobs/autocomplete/', api_views.JobAutocompleteAPIView.as_view(), name='job-autocomplete'),
+    path('api/jobs/<record_id:job_id>/', api_views.JobDetailAPIView.as_view(), name='job-detail'),
+    path('api/apply/<record_id:job_id>/', api_views.ApplyJobAPIView.as_view(), name='apply-job'),
     path('api/student/applications/', api_views.StudentApplicationsAPIView.as_view(), name='student-applications'),
+    path('api/student/applications/history/', api_views.StudentApplicationHistoryAPIView.as_view(), name='student-application-history'),
     path('api/upload-resume/', api_views.UploadResumeAPIView.as_view(), name='upload-resume'),
 
     # EMPLOYER ROUTES
     path('api/employer/jobs/', api_views.EmployerJobListAPIView.as_view(), name='employer-jobs'),
+    path('api/employer/jobs/history/', api_views.EmployerJobHistoryAPIView.as_view(), name='employer-job-history'),
+    path('api/employer/jobs/history/<record_id:job_id>/applications/', api_views.EmployerJobArchivedApplicationsAPIView.as_view(), name='employer-job-history-applications'),
     path('api/employer/jobs/create/', api_views.EmployerJobCreateAPIView.as_view(), name='employer-job-create'),
-    path('api/employer/jobs/<uuid:job_id>/update/', api_views.EmployerJobUpdateAPIView.as_view(), name='employer-job-update'),
-    path('api/employer/jobs/<uuid:job_id>/delete/', api_views.EmployerJobDeleteAPIView.as_view(), name='employer-job-delete'),
-    path('api/employer/jobs/<uuid:job_id>/applications/', api_views.EmployerJobApplicationsAPIView.as_view(), name='employer-job-applications'),
-    path('api/employer/applications/<uuid:application_id>/status/', api_views.UpdateApplicationStatusAPIView.as_view(), name='update-application-status'),
+    path('api/employer/jobs/import/', api_views.EmployerJobImportAPIView.as_view(), name='employer-job-import'),
+    path('api/employer/jobs/<record_id:job_id>/update/', api_views.EmployerJobUpdateAPIView.as_view(), name='employer-job-update'),
+    path('api/employer/jobs/<record_id:job_id>/delete/', api_views.EmployerJobDeleteAPIView.as_view(), name='employer-job-delete'),
+    path('api/employer/jobs/<record_id:job_id>/applications/', api_views.EmployerJobApplicationsAPIView.as_view(), name='employer-job-applications'),
+    path('api/employer/jobs/<record_id:job_id>/applications/export/', api_views.EmployerJobApplicationsExportAPIView.as_view(), name='employer-job-applications-export'),
+    path('api/employer/talent-search/', api_views.EmployerTalentSearchAPIView.as_view(), name='employer-talent-search'),
+    path('api/employer/applications/<record_id:application_id>/status/', api_views.UpdateApplicationStatusAPIView.as_view(), name='update-application-status'),
 
     # ADMIN ROUTES
     path('api/admin/pending-jobs/', api_views.PendingJobsAPIView.as_view(), name='pending-jobs'),
-    path('api/admin/approve/<uuid:job_id>/', api_views.ApproveJobAPIView.as_view(), name='approve-job'),
+    path('api/admin/approve/<record_id:job_id>/', api_views.ApproveJobAPIView.as_view(), name='approve-job'),
+    path('api/admin/stats/', api_views.PlatformStatsAPIView.as_view(), name='admin-stats'),
 ]
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -47,6 +48,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',   
+    'core.middleware.CompressionMiddleware',
+    'core.replicas.ReplicaRoutingMiddleware',
 
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -73,8 +76,68 @@ REST_FRAMEWORK = {
     
     # Schema for API docs
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+
+    # Reverse proxies in front of the app that append to X-Forwarded-For.
+    # With 0 the client IP for throttling is REMOTE_ADDR and a forged header
+    # is ignored; set it to the real proxy depth behind a load balancer.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
+
+    # Token bucket rates for core.throttling ('<throttle_scope>_ip' / '_user' / '_account')
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '10/min',
+        'login_account': '5/min',
+        'register_ip': '5/min',
+        'apply_ip': '60/min',
+        'apply_user': '10/min',
+    },
+
+    # JSON encoding/decoding: orjson when installed (see JSON_BACKEND)
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
+# Token buckets live in each worker by default; use
+# 'core.throttling.CacheBucketStore' (plus THROTTLE_CACHE_ALIAS) to share them
+# between processes through a cache such as Redis or Memcached.
+THROTTLE_BUCKET_STORE = 'core.throttling.LocalBucketStore'
+
+# Jobs older than this are moved to the archive tables by `manage.py archive_expired_jobs`
+JOB_RETENTION_DAYS = 180
+
+# Estimated Jaccard similarity above which core.dedupe flags two jobs as duplicates
+DUPLICATE_JOB_THRESHOLD = 0.8
+
+# Stale match scores a job or resume change rescores right after it commits
+# (only its own pairs); the rest is left to `manage.py rescore_applications`
+RESCORE_INLINE_LIMIT = 100
+
+# Idempotency-Key replay for the apply, resume upload and job create POSTs
+# (core.idempotency): how long a stored response is replayed, when an
+# in-flight original counts as abandoned, and how many keys one user may hold
+IDEMPOTENCY_KEY_TTL = 24 * 3600
+IDEMPOTENCY_LOCK_SECONDS = 60
+IDEMPOTENCY_MAX_KEYS_PER_USER = 1000
+
+# In-memory job autocomplete (core.autocomplete): seconds before a worker
+# rebuilds its index from the database, and distinct terms kept per field
+AUTOCOMPLETE_MAX_AGE = 300
+AUTOCOMPLETE_MAX_TERMS = 20_000
+
+# "auto" uses orjson if it is installed, "orjson" requires it, "stdlib" never uses it
+JSON_BACKEND = 'auto'
+
+# Responses below this many bytes are not worth compressing
+COMPRESSION_MIN_SIZE = 1024
+# Brotli (needs the brotli package) is preferred over gzip when the client accepts both
+COMPRESSION_BROTLI_QUALITY = 4
+
 
 SPECTACULAR_SETTINGS = {
     # --- General info ---
@@ -96,6 +159,8 @@ SPECTACULAR_SETTINGS = {
     "SORT_OPERATIONS": True,          # consistent ordering in docs
     "SORT_OPERATION_PARAMETERS": True,
     "COMPONENT_NO_READ_ONLY_REQUIRED": True,
+    # core.converters.RecordIdConverter path segments are UUIDs
+    "PATH_CONVERTER_OVERRIDES": {"record_id": {"type": "string", "format": "uuid"}},
 
     # --- Auth & Security ---
     "SECURITY": [
@@ -127,6 +192,11 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
+# Precomputed schema served by /api/schema/ (see `manage.py build_openapi_schema`).
+# Set SCHEMA_CODE_VERSION (e.g. to the deployed git sha) to skip hashing the sources.
+SCHEMA_CACHE_PATH = BASE_DIR / 'openapi-schema.json'
+SCHEMA_CODE_VERSION = None
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -164,6 +234,23 @@ DATABASES = {
     # to use mysql first mysql_client package should be installed
 }
 
+# Read replicas for the list and detail views (core.replicas.ReplicaRouter).
+# DB_REPLICAS=N adds N local replica SQLite files; keep them current with
+# `manage.py sync_replicas --interval 1`. Tests mirror them onto default.
+DATABASE_REPLICAS = []
+for _n in range(1, int(os.environ.get('DB_REPLICAS', '0')) + 1):
+    DATABASES[f'replica{_n}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / f'db.replica{_n}.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{_n}')
+
+DATABASE_ROUTERS = ['core.replicas.ReplicaRouter']
+
+# Seconds a client keeps reading from the primary after a write, to cover replica lag
+REPLICA_STICKY_SECONDS = 5
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
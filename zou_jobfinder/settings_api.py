@@ -0,0 +1,42 @@
+"""
+API-only settings profile for zou_jobfinder.
+
+Serves the JSON API and nothing else: no admin, no sessions/messages, no
+OpenAPI docs and no browsable API. Workers import less and boot faster.
+Use it with DJANGO_SETTINGS_MODULE=zou_jobfinder.settings_api and keep a
+process on the default settings for admin and docs.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    app for app in INSTALLED_APPS
+    if app not in (
+        'django.contrib.admin',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+        'drf_spectacular',
+        'drf_spectacular_sidecar',
+    )
+]
+
+# JWT auth is handled by DRF, so the session based middleware has nothing to do.
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware not in (
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+    )
+]
+
+TEMPLATES[0]['OPTIONS']['context_processors'] = [
+    processor for processor in TEMPLATES[0]['OPTIONS']['context_processors']
+    if processor != 'django.contrib.messages.context_processors.messages'
+]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ('core.renderers.FastJSONRenderer',),
+    'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.openapi.AutoSchema',
+}